@@ -1,13 +1,15 @@
-from typing import Any
+from typing import Any, Optional
 
-from ..utils.gemini_client import get_gemini_client
+from ..utils.chunking import summarize_large
+from ..utils.gemini_client import RoutedGeminiClient, get_async_gemini_client
 
 
 class ConversationAgent:
     """Handles chat-like learning and summary generation."""
 
-    def __init__(self) -> None:
-        self.client = get_gemini_client()
+    @property
+    def client(self) -> Optional[RoutedGeminiClient]:
+        return get_async_gemini_client("conversation")
 
     async def summarize_conversations(self, messages: list[dict[str, Any]]) -> str:
         if not self.client:
@@ -18,6 +20,5 @@ class ConversationAgent:
             "communication style, and interests. Return bullet points."
         )
         text = "\n".join([f"{m.get('sender', 'user')}: {m.get('text','')}" for m in messages])
-        response = self.client.generate_content(f"{prompt}\n\n{text}")
-        return response.text or "No summary generated"
+        return await summarize_large(self.client, prompt, text) or "No summary generated"
 
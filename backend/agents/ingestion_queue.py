@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from ..models.persona import PersonaUpdateRequest
+from ..utils.config import get_settings
+from ..utils.persona_store import get_persona_store
+from ..utils.user_locks import UserLocks
+from .profile_agent import ProfileAgent
+
+
+@dataclass
+class IngestionJob:
+    job_id: str
+    user_id: str
+    requests: list[PersonaUpdateRequest] = field(default_factory=list)
+    status: str = "queued"
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def merged_request(self) -> PersonaUpdateRequest:
+        """Collapse every coalesced request into a single learning pass."""
+        first = self.requests[0]
+        if len(self.requests) == 1:
+            return first
+        feedback = "\n".join(r.feedback for r in self.requests if r.feedback) or None
+        limits = [r.max_concurrency for r in self.requests if r.max_concurrency]
+        return PersonaUpdateRequest(
+            user_id=self.user_id,
+            signals=[signal for r in self.requests for signal in r.signals],
+            feedback=feedback,
+            max_concurrency=max(limits) if limits else None,
+            batched=first.batched,
+            # A full rebuild anywhere in the burst wins over incremental merges.
+            incremental=all(r.incremental for r in self.requests),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "user_id": self.user_id,
+            "status": self.status,
+            "coalesced": len(self.requests),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class IngestionQueue:
+    """Background worker pool that drains queued learn requests.
+
+    Requests for a user whose job has not started yet are folded into that job, so a
+    burst of learn calls for one user becomes a single synthesis pass.
+    """
+
+    def __init__(self, profile_agent: ProfileAgent) -> None:
+        settings = get_settings()
+        self.profile_agent = profile_agent
+        self.worker_count = settings.ingestion_workers
+        self.retention = settings.ingestion_job_retention
+        self.drain_seconds = settings.ingestion_drain_seconds
+        self._queue: asyncio.Queue[IngestionJob] = asyncio.Queue(
+            maxsize=settings.ingestion_queue_size
+        )
+        self._jobs: OrderedDict[str, IngestionJob] = OrderedDict()
+        self._pending: dict[str, IngestionJob] = {}
+        self._user_locks = UserLocks()
+        self._workers: list[asyncio.Task[None]] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"ingestion-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+
+    async def stop(self) -> None:
+        """Give queued jobs ``drain_seconds`` to finish, then cancel the workers.
+
+        Jobs cut off mid-run or never started are marked ``cancelled``.
+        """
+        if self._workers and self.drain_seconds > 0:
+            try:
+                await asyncio.wait_for(self._queue.join(), self.drain_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(f"Ingestion drain timed out with {self.depth} job(s) still queued")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._queue.task_done()
+            if self._pending.get(job.user_id) is job:
+                del self._pending[job.user_id]
+            job.status = "cancelled"
+            job.error = "Shut down before the job started"
+            job.finished_at = time.time()
+
+    def submit(self, request: PersonaUpdateRequest) -> IngestionJob:
+        """Queue a request, coalescing it into a pending job for the same user.
+
+        Raises ``asyncio.QueueFull`` when the queue is at capacity.
+        """
+        self.start()
+        pending = self._pending.get(request.user_id)
+        if pending is not None:
+            pending.requests.append(request)
+            return pending
+
+        job = IngestionJob(job_id=uuid.uuid4().hex, user_id=request.user_id, requests=[request])
+        self._queue.put_nowait(job)
+        self._pending[request.user_id] = job
+        self._remember(job)
+        return job
+
+    def get(self, job_id: str) -> IngestionJob | None:
+        return self._jobs.get(job_id)
+
+    def _remember(self, job: IngestionJob) -> None:
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.retention:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.status in ("queued", "running"):
+                break
+            del self._jobs[oldest_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: IngestionJob) -> None:
+        # Runs for one user are serialized so incremental merges never race; the lock is
+        # dropped once no job for that user holds or awaits it.
+        async with self._user_locks.hold(job.user_id):
+            if self._pending.get(job.user_id) is job:
+                del self._pending[job.user_id]
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                store = get_persona_store()
+                if not store:
+                    raise RuntimeError("Supabase client not configured")
+                await self.profile_agent.learn(job.merged_request(), store)
+                job.status = "done"
+            except asyncio.CancelledError:
+                job.status = "cancelled"
+                job.error = "Shut down before the job finished"
+                raise
+            except Exception as e:
+                logger.exception(f"Ingestion job {job.job_id} failed")
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
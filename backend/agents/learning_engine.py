@@ -1,19 +1,96 @@
 from __future__ import annotations
 
-from typing import Any, Callable
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Callable
 
-from ..models.persona import LearningSignal, Persona
-from ..utils.gemini_client import get_gemini_client
+from loguru import logger
+
+from ..models.persona import LearningSignal, Persona, PersonaNote
+from ..utils.activity_stats import (
+    calendar_features,
+    describe,
+    response_time_features,
+    task_features,
+)
+from ..utils.chunking import summarize_large
+from ..utils.config import get_settings
+from ..utils.deadlines import Deadline, LatencyWindow, hedge, until
+from ..utils.gemini_client import RoutedGeminiClient, get_async_gemini_client
+from ..utils.metrics import (
+    DEADLINE_EXCEEDED,
+    HEDGED_CALLS,
+    SIGNAL_HANDLER_FAILURES,
+    SIGNAL_HANDLER_SECONDS,
+    span,
+)
+from ..utils.note_index import dedupe_summaries
+from ..utils.signal_dedup import fingerprint, get_seen_signals
 from .activity_agent import ActivityAgent
 from .conversation_agent import ConversationAgent
 from .synthesis_agent import SynthesisAgent
 
+# Signal types whose handler is a single prompt over one payload field. These are
+# the ones that can be packed together into a batched analysis call.
+PROMPT_SIGNALS: dict[str, tuple[str, Callable[[dict[str, Any]], str]]] = {
+    "chat": (
+        "Analyze this chat message to extract personality traits, interests, "
+        "communication style, and preferences. Return concise bullet points.",
+        lambda payload: payload.get("message") or str(payload),
+    ),
+    "email_message": (
+        "Extract tone, clarity, and collaboration style from emails/messages. "
+        "Return concise bullet points.",
+        lambda payload: payload.get("text") or "",
+    ),
+    "documents": (
+        "Derive writing style, rigor, and preferred formats from these documents.",
+        lambda payload: payload.get("text") or "",
+    ),
+    "social_profile": (
+        "From public profile snippets, infer interests, professional focus, and voice.",
+        lambda payload: payload.get("bio") or "",
+    ),
+    "decision_history": (
+        "Analyze decision logs to extract heuristics, risk tolerance, and review cadence.",
+        lambda payload: payload.get("log") or "",
+    ),
+    "response_time": (
+        "Determine responsiveness patterns and urgency cues from timestamps.",
+        lambda payload: str(payload.get("timeline", "")),
+    ),
+    "sentiment": (
+        "Perform emotional tone analysis; capture sentiment trends and volatility.",
+        lambda payload: payload.get("text") or "",
+    ),
+    "topic_interest": (
+        "Map recurring topics and curiosity spikes; return ranked list.",
+        lambda payload: payload.get("text") or "",
+    ),
+    "feedback_loop": (
+        "Summarize user feedback to refine persona accuracy and preferences.",
+        lambda payload: payload.get("text") or "",
+    ),
+}
+
+# Numeric signals are reduced to statistics locally; the numbers become persona features
+# and their rendering is the note, so the only LLM pass they see is synthesis.
+LOCAL_SIGNALS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "response_time": lambda payload: response_time_features(
+        payload.get("timeline") or [], int(payload.get("utc_offset_minutes") or 0)
+    ),
+    "calendar": lambda payload: calendar_features(
+        payload.get("events") or [], int(payload.get("utc_offset_minutes") or 0)
+    ),
+    "tasks": lambda payload: task_features(payload.get("tasks") or []),
+}
+
 
 class LearningEngine:
     """Central coordinator for 10+ learning methods."""
 
     def __init__(self) -> None:
-        self.gemini = get_gemini_client()
         self.activity_agent = ActivityAgent()
         self.conversation_agent = ConversationAgent()
         self.synthesis_agent = SynthesisAgent()
@@ -30,123 +107,403 @@ class LearningEngine:
             "topic_interest": self._analyze_topics,
             "feedback_loop": self._analyze_feedback,
         }
+        self._latency: dict[str, LatencyWindow] = {}
+
+    @staticmethod
+    def gemini(route: str) -> RoutedGeminiClient | None:
+        # Looked up per call (a cached singleton per route) so constructing the agent graph
+        # stays cheap and does not import the Gemini SDK until a signal is analyzed.
+        return get_async_gemini_client(route)
 
     async def process_signals(
-        self, user_id: str, signals: list[LearningSignal], feedback: str | None
+        self,
+        user_id: str,
+        signals: list[LearningSignal],
+        feedback: str | None,
+        max_concurrency: int | None = None,
+        batched: bool | None = None,
+        existing: Persona | None = None,
+        deadline: Deadline | None = None,
+        base_version: int = 0,
     ) -> Persona:
-        summaries: list[str] = []
-        persona: Persona = {
-            "user_id": user_id,
-            "traits": [],
-            "preferences": [],
-            "interests": [],
-            "risks": [],
-            "notes": [],
-        }
+        """Analyze signals into a persona.
+
+        When ``existing`` (a stored persona) is given, only the new summaries are
+        synthesized against its traits and the result is merged onto it. Otherwise the
+        persona is rebuilt from scratch as ``base_version + 1``, where ``base_version`` is
+        the stored version it replaces. The returned ``notes`` only hold notes produced
+        by this call; stored notes are append-only.
+
+        With a ``deadline``, signals still running when the handler share of it runs out
+        are dropped and listed in ``missing_signals``; synthesis uses what finished.
+        """
+        persona: Persona | None = None
+        async for event, data in self.iter_process(
+            user_id,
+            signals,
+            feedback,
+            max_concurrency,
+            batched,
+            existing,
+            deadline=deadline,
+            base_version=base_version,
+        ):
+            if event == "persona":
+                persona = data
+        assert persona is not None
+        return persona
 
-        for signal in signals:
-            handler = self.method_map.get(signal.type)
-            if not handler:
-                continue
-            summary = await handler(signal.payload)
-            if summary:
-                summaries.append(summary)
-                persona["notes"].append({"type": signal.type, "summary": summary})
+    async def iter_process(
+        self,
+        user_id: str,
+        signals: list[LearningSignal],
+        feedback: str | None,
+        max_concurrency: int | None = None,
+        batched: bool | None = None,
+        existing: Persona | None = None,
+        stream_synthesis: bool = False,
+        deadline: Deadline | None = None,
+        base_version: int = 0,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Yield ``(event, data)`` pairs while building a persona.
 
+        Events are ``summary`` once per analyzed signal in completion order, ``synthesis``
+        for each merge text delta when ``stream_synthesis`` is set, and a final ``persona``.
+        """
+        persona = Persona(user_id=user_id, version=base_version + 1)
+        prior_notes: list[PersonaNote] = []
+        if existing:
+            # Shallow copy: the synthesized fields are replaced below, never mutated in place.
+            persona = existing.model_copy(update={"notes": []})
+            prior_notes = existing.notes
+
+        # Each job is (note type, method_map key, payload).
+        jobs: list[tuple[str, str, dict[str, Any]]] = [
+            (signal.type, signal.type, signal.payload)
+            for signal in signals
+            if signal.type in self.method_map
+        ]
         if feedback:
-            feedback_summary = await self._analyze_feedback({"text": feedback})
-            summaries.append(feedback_summary)
-            persona["notes"].append({"type": "feedback", "summary": feedback_summary})
+            jobs.append(("feedback", "feedback_loop", {"text": feedback}))
 
-        merged = await self.synthesis_agent.merge_signals(summaries)
-        persona["traits"].append(merged)
-        return persona
+        settings = get_settings()
+        fingerprints: list[str] = []
+        if settings.signal_dedup_enabled:
+            # Collapse repeats within the request. Signals already analyzed for this user
+            # are only skipped on incremental updates, where their notes are carried over.
+            seen = get_seen_signals()
+            prints = [fingerprint(method, payload) for _, method, payload in jobs]
+            skip = seen.seen(user_id, prints) if existing else set()
+            unique: dict[str, tuple[str, str, dict[str, Any]]] = {}
+            for fp, job in zip(prints, jobs):
+                if fp not in skip and fp not in unique:
+                    unique[fp] = job
+            if len(unique) < len(jobs):
+                logger.info(f"Skipping {len(jobs) - len(unique)} duplicate signal(s) for {user_id}")
+            fingerprints, jobs = list(unique), list(unique.values())
+        use_batching = settings.learning_batch_enabled if batched is None else batched
+        local = LOCAL_SIGNALS if settings.local_analyzers_enabled else {}
+        features: dict[str, dict[str, Any]] = {}
+        # Handlers get the budget minus a reserve for synthesis; synthesis gets the rest.
+        handlers_deadline = (
+            deadline.portion(1 - settings.learn_synthesis_share) if deadline else None
+        )
 
-    async def _analyze_chat(self, payload: dict[str, Any]) -> str:
-        """Handle chat/conversation signals."""
-        if not self.gemini:
+        batchable = [
+            i
+            for i, (_, method, payload) in enumerate(jobs)
+            if use_batching
+            and method in PROMPT_SIGNALS
+            and method not in local
+            and len(PROMPT_SIGNALS[method][1](payload)) <= settings.learning_batch_max_chars
+        ]
+        if len(batchable) < 2:
+            batchable = []
+        size = max(2, settings.learning_batch_max_signals)
+        units = [batchable[i : i + size] for i in range(0, len(batchable), size)]
+        batched_jobs = set(batchable)
+        units += [[i] for i in range(len(jobs)) if i not in batched_jobs]
+        # 0 runs every unit at once; the shared Gemini limiter still guards the quota.
+        limit = max_concurrency or settings.learning_max_concurrency
+        semaphore = asyncio.Semaphore(limit if limit > 0 else max(1, len(units)))
+
+        results: list[str | None] = [None] * len(jobs)
+        completed: asyncio.Queue[list[int]] = asyncio.Queue()
+
+        async def run(indices: list[int]) -> None:
+            try:
+                async with semaphore:
+                    if len(indices) == 1:
+                        note_type, method, payload = jobs[indices[0]]
+                        if method in local:
+                            handler = self._local_handler(note_type, local[method], features)
+                        elif settings.hedge_enabled:
+                            handler = self._hedged(note_type, self.method_map[method])
+                        else:
+                            handler = self.method_map[method]
+                        with SIGNAL_HANDLER_SECONDS.time(note_type), span(f"signal.{note_type}"):
+                            results[indices[0]] = await self._run_isolated(
+                                note_type, handler, payload
+                            )
+                        return
+                    with SIGNAL_HANDLER_SECONDS.time("batch"), span("signal.batch"):
+                        batch = await self._analyze_batch([jobs[i][1:] for i in indices])
+                    for i, summary in zip(indices, batch):
+                        results[i] = summary
+            finally:
+                completed.put_nowait(indices)
+
+        tasks = [asyncio.create_task(run(unit)) for unit in units]
+        finished: set[int] = set()
+        try:
+            for _ in units:
+                if completed.empty() and handlers_deadline:
+                    try:
+                        indices = await asyncio.wait_for(
+                            completed.get(), handlers_deadline.remaining()
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    indices = await completed.get()
+                finished.update(indices)
+                for i in indices:
+                    yield "summary", {"index": i, "type": jobs[i][0], "summary": results[i]}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        missing = [i for i in range(len(jobs)) if i not in finished]
+        if missing:
+            DEADLINE_EXCEEDED.inc("signals")
+            persona.missing_signals = [jobs[i][0] for i in missing]
+            logger.warning(
+                f"Deadline hit for {user_id}; synthesizing without {persona.missing_signals}"
+            )
+            for i in missing:
+                results[i] = None
+
+        if fingerprints:
+            # Marked seen by whoever persists the persona, so a failed write can be retried.
+            persona.signal_fingerprints = [
+                fp for fp, summary in zip(fingerprints, results) if summary
+            ]
+
+        # Results are indexed by job, so notes stay in the order signals were sent.
+        new_notes = [
+            PersonaNote(type=signal_type, summary=summary)
+            for (signal_type, _, _), summary in zip(jobs, results)
+            if summary
+        ]
+        if settings.note_dedup_enabled and new_notes:
+            # Near-duplicates of stored notes or of each other add nothing to synthesis.
+            keep = dedupe_summaries(
+                [note.summary for note in new_notes],
+                [note.summary for note in prior_notes],
+                threshold=settings.note_dedup_threshold,
+                dim=settings.note_index_dim,
+            )
+            new_notes = [note for note, kept in zip(new_notes, keep) if kept]
+        persona.notes = new_notes
+        if features:
+            persona.features = {**persona.features, **features}
+        summaries = [note.summary for note in new_notes]
+
+        if existing and not summaries:
+            persona.version += 1
+            yield "persona", persona
+            return
+
+        traits = persona.traits if existing else None
+        merged: str | None = None
+        try:
+            with SIGNAL_HANDLER_SECONDS.time("synthesis"), span("synthesis"):
+                if stream_synthesis:
+                    stream = self.synthesis_agent.stream_merge(summaries, traits)
+                    deltas: list[str] = []
+                    async for delta in until(stream, deadline) if deadline else stream:
+                        deltas.append(delta)
+                        yield "synthesis", delta
+                    merged = "".join(deltas)
+                else:
+                    merge = (
+                        self.synthesis_agent.merge_incremental(persona.traits, summaries)
+                        if existing
+                        else self.synthesis_agent.merge_signals(summaries)
+                    )
+                    merged = await asyncio.wait_for(
+                        merge, deadline.remaining() if deadline else None
+                    )
+        except asyncio.TimeoutError:
+            # Keep the previous traits; the new notes are still stored.
+            DEADLINE_EXCEEDED.inc("synthesis")
+            persona.missing_signals.append("synthesis")
+            logger.warning(f"Deadline hit during synthesis for {user_id}")
+
+        if existing:
+            if merged is not None:
+                persona.traits = [merged]
+            persona.version += 1
+        elif merged is not None:
+            persona.traits.append(merged)
+        yield "persona", persona
+
+    def _hedged(
+        self, note_type: str, handler: Callable[[dict[str, Any]], Any]
+    ) -> Callable[[dict[str, Any]], Any]:
+        """Wrap ``handler`` so a duplicate call races it past this type's tail latency."""
+        settings = get_settings()
+        window = self._latency.get(note_type)
+        if window is None:
+            window = self._latency[note_type] = LatencyWindow(
+                settings.hedge_window, settings.hedge_min_samples
+            )
+
+        async def handle(payload: dict[str, Any]) -> str:
+            start = time.perf_counter()
+            result = await hedge(
+                lambda: handler(payload),
+                window.quantile(settings.hedge_quantile),
+                on_hedge=lambda: HEDGED_CALLS.inc(note_type),
+            )
+            window.observe(time.perf_counter() - start)
+            return result
+
+        return handle
+
+    @staticmethod
+    def _local_handler(
+        note_type: str,
+        analyze: Callable[[dict[str, Any]], dict[str, Any]],
+        features: dict[str, dict[str, Any]],
+    ) -> Callable[[dict[str, Any]], Any]:
+        async def handle(payload: dict[str, Any]) -> str:
+            # Vectorized, but timestamp parsing is per item; keep large timelines off the loop.
+            stats = await asyncio.to_thread(analyze, payload)
+            features[note_type] = stats
+            return describe(note_type, stats)
+
+        return handle
+
+    async def _run_prompt(self, signal_type: str, payload: dict[str, Any]) -> str:
+        gemini = self.gemini(signal_type)
+        if not gemini:
             return "Gemini client not configured"
-        message = payload.get("message") or str(payload)
+        prompt, extract = PROMPT_SIGNALS[signal_type]
+        return await gemini.generate(prompt, extract(payload))
+
+    async def _analyze_batch(self, items: list[tuple[str, dict[str, Any]]]) -> list[str | None]:
+        """Analyze several prompt-only signals in one structured call.
+
+        Falls back to one call per signal when the response is not a JSON object
+        holding a string for every requested key.
+        """
+        gemini = self.gemini("batch")
+        if not gemini:
+            return ["Gemini client not configured"] * len(items)
+
+        keys: list[str] = []
+        counts: dict[str, int] = {}
+        sections: list[str] = []
+        for signal_type, payload in items:
+            count = counts[signal_type] = counts.get(signal_type, 0) + 1
+            key = signal_type if count == 1 else f"{signal_type}#{count}"
+            keys.append(key)
+            prompt, extract = PROMPT_SIGNALS[signal_type]
+            sections.append(f"### {key}\nTask: {prompt}\nInput:\n{extract(payload)}")
+
         prompt = (
-            "Analyze this chat message to extract personality traits, interests, "
-            "communication style, and preferences. Return concise bullet points."
+            "You will receive several persona learning signals, each under a '### <key>' "
+            "heading with its own task. Perform every task independently and respond with "
+            "only a JSON object mapping each key to its analysis as a string. Keys: "
+            + json.dumps(keys)
         )
+
+        def complete(raw: str) -> bool:
+            parsed = _parse_json_object(raw)
+            return parsed is not None and all(isinstance(parsed.get(key), str) for key in keys)
+
         try:
-            response = self.gemini.generate_content(f"{prompt}\n\n{message}")
-            return response.text or "No analysis generated"
+            # An incomplete object from the fast tier is retried on the strong tier first.
+            raw = await gemini.generate(prompt, "\n\n".join(sections), validate=complete)
         except Exception as e:
-            return f"Error analyzing chat: {str(e)}"
+            logger.warning(f"Batched analysis failed: {e}")
+            raw = ""
 
-    async def _analyze_email_message(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
-            return "Gemini client not configured"
-        prompt = (
-            "Extract tone, clarity, and collaboration style from emails/messages. "
-            "Return concise bullet points."
+        if complete(raw):
+            parsed = _parse_json_object(raw)
+            return [parsed[key] for key in keys]
+
+        logger.info(f"Batched analysis unusable; falling back to {len(items)} single calls")
+        return list(
+            await asyncio.gather(
+                *(self._run_isolated(t, self.method_map[t], p) for t, p in items)
+            )
         )
-        text = payload.get("text") or ""
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+
+    @staticmethod
+    async def _run_isolated(
+        signal_type: str, handler: Callable[[dict[str, Any]], Any], payload: dict[str, Any]
+    ) -> str | None:
+        try:
+            return await handler(payload)
+        except Exception as e:
+            SIGNAL_HANDLER_FAILURES.inc(signal_type)
+            logger.warning(f"Signal handler '{signal_type}' failed: {e}")
+            return None
+
+    async def _analyze_chat(self, payload: dict[str, Any]) -> str:
+        """Handle chat/conversation signals."""
+        gemini = self.gemini("chat")
+        if not gemini:
+            return "Gemini client not configured"
+        prompt, extract = PROMPT_SIGNALS["chat"]
+        # Failures propagate so they are dropped, not stored as if they were a summary.
+        return await gemini.generate(prompt, extract(payload)) or "No analysis generated"
+
+    async def _analyze_email_message(self, payload: dict[str, Any]) -> str:
+        return await self._run_prompt("email_message", payload)
 
     async def _analyze_calendar(self, payload: dict[str, Any]) -> str:
         events = payload.get("events", [])
         return await self.activity_agent.summarize_calendar(events)
 
     async def _analyze_documents(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
+        gemini = self.gemini("documents")
+        if not gemini:
             return "Gemini client not configured"
-        prompt = (
-            "Derive writing style, rigor, and preferred formats from these documents."
-        )
-        text = payload.get("text") or ""
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+        prompt, extract = PROMPT_SIGNALS["documents"]
+        return await summarize_large(gemini, prompt, extract(payload))
 
     async def _analyze_social(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
-            return "Gemini client not configured"
-        prompt = (
-            "From public profile snippets, infer interests, professional focus, and voice."
-        )
-        text = payload.get("bio") or ""
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+        return await self._run_prompt("social_profile", payload)
 
     async def _analyze_decisions(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
-            return "Gemini client not configured"
-        prompt = (
-            "Analyze decision logs to extract heuristics, risk tolerance, and review cadence."
-        )
-        text = payload.get("log") or ""
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+        return await self._run_prompt("decision_history", payload)
 
     async def _analyze_tasks(self, payload: dict[str, Any]) -> str:
         tasks = payload.get("tasks", [])
         return await self.activity_agent.summarize_tasks(tasks)
 
     async def _analyze_response_time(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
-            return "Gemini client not configured"
-        prompt = "Determine responsiveness patterns and urgency cues from timestamps."
-        text = str(payload.get("timeline", ""))
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+        return await self._run_prompt("response_time", payload)
 
     async def _analyze_sentiment(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
-            return "Gemini client not configured"
-        prompt = "Perform emotional tone analysis; capture sentiment trends and volatility."
-        text = payload.get("text") or ""
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+        return await self._run_prompt("sentiment", payload)
 
     async def _analyze_topics(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
-            return "Gemini client not configured"
-        prompt = "Map recurring topics and curiosity spikes; return ranked list."
-        text = payload.get("text") or ""
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+        return await self._run_prompt("topic_interest", payload)
 
     async def _analyze_feedback(self, payload: dict[str, Any]) -> str:
-        if not self.gemini:
-            return "Gemini client not configured"
-        prompt = "Summarize user feedback to refine persona accuracy and preferences."
-        text = payload.get("text") or ""
-        return self.gemini.generate_content(f"{prompt}\n\n{text}").text or ""
+        return await self._run_prompt("feedback_loop", payload)
+
 
+def _parse_json_object(raw: str) -> dict[str, Any] | None:
+    text = raw.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
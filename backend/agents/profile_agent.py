@@ -1,7 +1,84 @@
-from typing import Any
+import asyncio
+import base64
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
 
 from ..agents.learning_engine import LearningEngine
-from ..utils.gemini_client import get_gemini_client
+from ..models.persona import Persona, PersonaNote, PersonaUpdateRequest
+from ..utils.change_feed import get_change_hub
+from ..utils.config import get_settings
+from ..utils.deadlines import Deadline
+from ..utils.gemini_client import RoutedGeminiClient, get_async_gemini_client
+from ..utils.persona_cache import get_persona_cache
+from ..utils.persona_store import PersonaStore
+from ..utils.signal_dedup import get_seen_signals
+from ..utils.user_locks import UserLocks
+
+
+def encode_cursor(created_at: str, note_id: int) -> str:
+    raw = json.dumps([created_at, note_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        created_at, note_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), int(note_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid notes cursor") from e
+
+
+class _WriteBatch:
+    """Coalesces persona writes from concurrent learns into multi-row flushes.
+
+    ``write`` returns once the flush holding that persona has landed (or failed).
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[Persona]], Awaitable[None]],
+        size: int,
+        window: float,
+    ) -> None:
+        self._flush = flush
+        self.size = size
+        self.window = window
+        self._buffered: list[tuple[Persona, asyncio.Future[None]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    async def write(self, persona: Persona) -> None:
+        loop = asyncio.get_running_loop()
+        written: asyncio.Future[None] = loop.create_future()
+        self._buffered.append((persona, written))
+        if len(self._buffered) >= self.size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+        await written
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffered:
+            return
+        batch, self._buffered = self._buffered, []
+        task = asyncio.create_task(self._run(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, batch: list[tuple[Persona, asyncio.Future[None]]]) -> None:
+        try:
+            await self._flush([persona for persona, _ in batch])
+        except Exception as e:
+            for _, written in batch:
+                if not written.done():
+                    written.set_exception(e)
+        else:
+            for _, written in batch:
+                if not written.done():
+                    written.set_result(None)
 
 
 class ProfileAgent:
@@ -9,12 +86,183 @@ class ProfileAgent:
 
     def __init__(self, learning_engine: LearningEngine) -> None:
         self.learning_engine = learning_engine
-        self.client = get_gemini_client()
+        # Serializes read-merge-write per user so concurrent learns never drop a version.
+        self.user_locks = UserLocks()
+
+    @property
+    def client(self) -> Optional[RoutedGeminiClient]:
+        return get_async_gemini_client("profile")
+
+    async def learn(
+        self,
+        request: PersonaUpdateRequest,
+        store: PersonaStore,
+        deadline: Deadline | None = None,
+    ) -> Persona:
+        """Run the learning pipeline for one request and persist the result."""
+        async with self.user_locks.hold(request.user_id):
+            existing, base_version = await self._load_base(request, store)
+            persona = await self._analyze(request, existing, deadline, base_version)
+            await self.persist_persona(user_id=request.user_id, persona=persona, store=store)
+        return persona
+
+    async def learn_stream(
+        self,
+        request: PersonaUpdateRequest,
+        store: PersonaStore,
+        deadline: Deadline | None = None,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Like ``learn`` but yields per-signal summaries and synthesis deltas as they land.
+
+        The final ``persona`` event is only emitted once the persona has been persisted.
+        """
+        async with self.user_locks.hold(request.user_id):
+            existing, base_version = await self._load_base(request, store)
+            async for event, data in self.learning_engine.iter_process(
+                user_id=request.user_id,
+                signals=request.signals,
+                feedback=request.feedback,
+                max_concurrency=request.max_concurrency,
+                batched=request.batched,
+                existing=existing,
+                stream_synthesis=True,
+                deadline=deadline,
+                base_version=base_version,
+            ):
+                if event == "persona":
+                    await self.persist_persona(user_id=request.user_id, persona=data, store=store)
+                yield event, data
+
+    async def learn_many(
+        self,
+        requests: list[PersonaUpdateRequest],
+        store: PersonaStore,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Learn personas for many users, yielding one result per request as it lands.
+
+        Each user is loaded, analyzed and persisted under the same per-user lock as
+        ``learn``. Finished personas are written with one multi-row upsert once a chunk
+        fills or ``persona_batch_flush_ms`` has passed since the first of them finished;
+        results are yielded after their flush. A failure for one user is reported in its
+        own result instead of aborting the batch. Raises ``ValueError`` on duplicate
+        ``user_id``s, which would otherwise overwrite each other.
+        """
+        user_ids = [r.user_id for r in requests]
+        if len(set(user_ids)) < len(user_ids):
+            raise ValueError("Each user_id may appear only once per batch")
+        settings = get_settings()
+        semaphore = asyncio.Semaphore(
+            max(1, max_concurrency or settings.persona_batch_max_concurrency)
+        )
+        batch = _WriteBatch(
+            lambda personas: self.persist_personas(personas, store=store),
+            size=settings.persona_batch_chunk_size,
+            window=settings.persona_batch_flush_ms / 1000,
+        )
+
+        async def run(request: PersonaUpdateRequest) -> dict[str, Any]:
+            try:
+                async with self.user_locks.hold(request.user_id):
+                    async with semaphore:
+                        existing, base_version = await self._load_base(request, store)
+                        persona = await self._analyze(
+                            request, existing, base_version=base_version
+                        )
+                    # Still holding the lock: the next learn for this user reads this write.
+                    await batch.write(persona)
+            except Exception as e:
+                return {"user_id": request.user_id, "status": "error", "error": str(e)}
+            return {"user_id": request.user_id, "status": "ok", "persona": persona}
+
+        tasks = [asyncio.create_task(run(r)) for r in requests]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _analyze(
+        self,
+        request: PersonaUpdateRequest,
+        existing: Persona | None,
+        deadline: Deadline | None = None,
+        base_version: int = 0,
+    ) -> Persona:
+        return await self.learning_engine.process_signals(
+            user_id=request.user_id,
+            signals=request.signals,
+            feedback=request.feedback,
+            max_concurrency=request.max_concurrency,
+            batched=request.batched,
+            existing=existing,
+            deadline=deadline,
+            base_version=base_version,
+        )
+
+    async def _load_base(
+        self, request: PersonaUpdateRequest, store: PersonaStore
+    ) -> tuple[Persona | None, int]:
+        """The persona an incremental learn merges onto, or the version a rebuild replaces."""
+        if request.incremental:
+            return await self.load_persona(user_id=request.user_id, store=store), 0
+        stored = await store.get(request.user_id)
+        return None, stored.version if stored else 0
+
+    async def load_persona(self, user_id: str, store: PersonaStore) -> Persona | None:
+        """Load the stored persona plus its most recent notes as dedup context."""
+        persona = await store.get(user_id)
+        if persona is None:
+            return None
+        persona.notes = await store.recent_notes(
+            user_id, limit=get_settings().note_context_limit
+        )
+        return persona
+
+    async def load_notes(
+        self, user_id: str, store: PersonaStore, cursor: str | None = None, limit: int = 50
+    ) -> tuple[list[PersonaNote], str | None]:
+        """Page through a user's notes oldest first with a keyset cursor.
+
+        Returns the page and the cursor for the next one (``None`` on the last page).
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows = await store.notes_after(user_id, after=after, limit=limit + 1)
+        if len(rows) <= limit:
+            return rows, None
+        page = rows[:limit]
+        return page, encode_cursor(page[-1].created_at, page[-1].id)
+
+    async def persist_personas(self, personas: list[Persona], store: PersonaStore) -> None:
+        # Postgres rejects an upsert touching the same row twice, so keep the last per user.
+        latest = {persona.user_id: persona for persona in personas}
+        await store.upsert_many(list(latest.values()))
+        await store.insert_notes(
+            [(persona.user_id, note) for persona in personas for note in persona.notes]
+        )
+        cache = get_persona_cache()
+        for user_id in latest:
+            cache.invalidate(user_id)
+        seen = get_seen_signals()
+        for persona in personas:
+            if persona.signal_fingerprints:
+                seen.mark(persona.user_id, persona.signal_fingerprints)
+        hub = get_change_hub()
+        for persona in latest.values():
+            await hub.publish(persona)
 
-    async def persist_persona(self, user_id: str, persona: dict[str, Any], supabase: Any) -> None:
-        supabase.table("personas").upsert({"user_id": user_id, **persona}).execute()
+    async def persist_persona(self, user_id: str, persona: Persona, store: PersonaStore) -> None:
+        """Upsert the synthesized state and append only the notes produced by this update."""
+        await store.upsert(persona)
+        if persona.notes:
+            await store.insert_notes([(user_id, note) for note in persona.notes])
+        get_persona_cache().invalidate(user_id)
+        if persona.signal_fingerprints:
+            get_seen_signals().mark(user_id, persona.signal_fingerprints)
+        await get_change_hub().publish(persona)
 
-    async def synthesize_profile(self, user_id: str, persona: dict[str, Any]) -> str:
+    async def synthesize_profile(self, user_id: str, persona: Persona) -> str:
         if not self.client:
             return "Gemini client not configured"
         prompt = (
@@ -22,7 +270,7 @@ class ProfileAgent:
             "preferences, strengths, and cautions."
         )
         return (
-            self.client.generate_content(f"{prompt}\n\n{persona}").text
+            await self.client.generate(prompt, persona.model_dump_json())
             or "Profile synthesis unavailable"
         )
 
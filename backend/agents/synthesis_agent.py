@@ -1,21 +1,52 @@
-from typing import Any
+from typing import Any, AsyncIterator, Optional
 
-from ..utils.gemini_client import get_gemini_client
+from ..utils.gemini_client import RoutedGeminiClient, get_async_gemini_client
+
+MERGE_PROMPT = (
+    "Merge these persona learning summaries into a single, deduplicated persona snapshot "
+    "with traits, habits, and cautions."
+)
+INCREMENTAL_PROMPT = (
+    "Update this persona snapshot with the new learning summaries. Keep existing "
+    "traits unless contradicted, add new ones, and return the full deduplicated "
+    "snapshot with traits, habits, and cautions."
+)
 
 
 class SynthesisAgent:
     """Turns multiple signal summaries into unified insights."""
 
-    def __init__(self) -> None:
-        self.client = get_gemini_client()
+    @property
+    def client(self) -> Optional[RoutedGeminiClient]:
+        return get_async_gemini_client("synthesis")
 
     async def merge_signals(self, summaries: list[str]) -> str:
         if not self.client:
             return "Gemini client not configured"
-        prompt = (
-            "Merge these persona learning summaries into a single, deduplicated persona snapshot "
-            "with traits, habits, and cautions."
-        )
         text = "\n- ".join(summaries)
-        return self.client.generate_content(f"{prompt}\n\n{text}").text or ""
+        return await self.client.generate(MERGE_PROMPT, text)
+
+    async def merge_incremental(self, traits: list[Any], summaries: list[str]) -> str:
+        """Fold new summaries into an existing snapshot without re-reading history."""
+        if not self.client:
+            return "Gemini client not configured"
+        return await self.client.generate(INCREMENTAL_PROMPT, _incremental_text(traits, summaries))
+
+    async def stream_merge(
+        self, summaries: list[str], traits: list[Any] | None = None
+    ) -> AsyncIterator[str]:
+        """Stream the merge (or, given ``traits``, the incremental merge) as text deltas."""
+        if not self.client:
+            yield "Gemini client not configured"
+            return
+        if traits is None:
+            stream = self.client.stream(MERGE_PROMPT, "\n- ".join(summaries))
+        else:
+            stream = self.client.stream(INCREMENTAL_PROMPT, _incremental_text(traits, summaries))
+        async for delta in stream:
+            yield delta
+
 
+def _incremental_text(traits: list[Any], summaries: list[str]) -> str:
+    current = "\n".join(str(trait) for trait in traits) or "(empty)"
+    return "Current snapshot:\n" + current + "\n\nNew summaries:\n- " + "\n- ".join(summaries)
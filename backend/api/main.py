@@ -1,5 +1,87 @@
-from fastapi import FastAPI
-from .routes import health, persona
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response
+from loguru import logger
+
+from ..utils.config import get_settings
+from ..utils.gemini_client import close_gemini_clients
+from ..utils.metrics import HTTP_REQUEST_SECONDS, trace
+from ..utils.persona_store import get_persona_store
+from ..utils.supabase_client import close_async_postgrest
+from ..utils.write_behind import WriteBehindStore
+from .routes import health, metrics, persona
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # The agent graph is built here rather than at import so cold starts stay cheap.
+    ingestion_queue = persona.get_ingestion_queue()
+    ingestion_queue.start()
+    store = get_persona_store()
+    write_behind = store if isinstance(store, WriteBehindStore) else None
+    if write_behind:
+        # Replays the crash journal, if any, before new writes arrive.
+        write_behind.start()
+    yield
+    await ingestion_queue.stop()
+    if write_behind:
+        await write_behind.stop()
+    close_gemini_clients()
+    await close_async_postgrest()
+
+
+async def observe_request(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Record request latency; with tracing on, also collect spans into Server-Timing.
+
+    Latency runs until the body is fully sent (or the client goes away), so streamed
+    responses (SSE, NDJSON, exports) are timed end to end. Server-Timing can only carry
+    the spans that finished before the headers went out; the log line has all of them.
+    """
+    start = time.perf_counter()
+    traced = get_settings().tracing_enabled or request.headers.get("x-trace") == "1"
+    if not traced:
+        spans = None
+        response = await call_next(request)
+    else:
+        with trace() as spans:
+            response = await call_next(request)
+        timings = [
+            f'{i};desc="{name}";dur={duration * 1000:.1f}'
+            for i, (name, _, duration) in enumerate(spans)
+        ]
+        if timings:
+            response.headers["Server-Timing"] = ", ".join(timings)
+    route = request.scope.get("route")
+    labels = (request.method, getattr(route, "path", "unmatched"), str(response.status_code))
+
+    def finish() -> None:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, *labels)
+        if spans is not None:
+            logger.info(
+                f"{request.method} {request.url.path} spans: "
+                + ", ".join(
+                    f"{name}={(s - start) * 1000:.1f}+{d * 1000:.1f}ms" for name, s, d in spans
+                )
+            )
+
+    body = getattr(response, "body_iterator", None)
+    if body is None:
+        finish()
+        return response
+
+    async def observed_body() -> AsyncIterator[Any]:
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            finish()
+
+    response.body_iterator = observed_body()
+    return response
 
 
 def create_app() -> FastAPI:
@@ -7,11 +89,13 @@ def create_app() -> FastAPI:
         title="Hackathon Persona Agents",
         version="0.1.0",
         description="AI persona learning platform powered by Gemini 3.0 Pro Preview.",
+        lifespan=lifespan,
     )
+    app.middleware("http")(observe_request)
     app.include_router(health.router)
+    app.include_router(metrics.router)
     app.include_router(persona.router, prefix="/persona", tags=["persona"])
     return app
 
 
 app = create_app()
-
@@ -1,5 +1,5 @@
 # Re-export routers for FastAPI inclusion
-from . import health, persona
+from . import health, metrics, persona
 
-__all__ = ["health", "persona"]
+__all__ = ["health", "metrics", "persona"]
 
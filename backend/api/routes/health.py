@@ -1,5 +1,9 @@
+from typing import Any
+
 from fastapi import APIRouter
 
+from ...utils.gemini_client import get_rate_limiter
+
 router = APIRouter()
 
 
@@ -7,3 +11,9 @@ router = APIRouter()
 async def health() -> dict[str, str]:
     return {"status": "ok"}
 
+
+@router.get("/health/gemini")
+async def gemini_health() -> dict[str, Any]:
+    """Queue depth, adaptive concurrency and throttle counters of the Gemini limiter."""
+    return get_rate_limiter().snapshot()
+
@@ -0,0 +1,59 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ...utils.gemini_client import get_rate_limiter
+from ...utils.llm_cache import get_llm_cache
+from ...utils.metrics import register_gauge, registry
+from ...utils.persona_store import get_persona_store
+from ...utils.write_behind import WriteBehindStore
+from . import persona
+
+router = APIRouter()
+
+
+def _llm_cache_stats() -> dict[tuple[str, ...], float]:
+    cache = get_llm_cache()
+    if not cache:
+        return {}
+    return {
+        (tier, stat): float(value)
+        for tier, stats in cache.snapshot().items()
+        for stat, value in stats.items()
+    }
+
+
+def _write_behind_stats() -> dict[tuple[str, ...], float]:
+    store = get_persona_store()
+    if not isinstance(store, WriteBehindStore):
+        return {}
+    return {(kind,): float(count) for kind, count in store.snapshot().items()}
+
+
+def _limiter_stats() -> dict[tuple[str, ...], float]:
+    return {(stat,): float(value) for stat, value in get_rate_limiter().snapshot().items()}
+
+
+register_gauge(
+    "persona_llm_cache_stats",
+    "LLM response cache counters by tier",
+    ("tier", "stat"),
+    _llm_cache_stats,
+)
+register_gauge("persona_gemini_limiter", "Gemini rate limiter state", ("stat",), _limiter_stats)
+register_gauge(
+    "persona_ingestion_queue_depth",
+    "Learn jobs waiting for a worker",
+    (),
+    lambda: {(): float(persona.get_ingestion_queue().depth)},
+)
+register_gauge(
+    "persona_write_behind_pending",
+    "Buffered persona writes not yet flushed",
+    ("kind",),
+    _write_behind_stats,
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,37 +1,335 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Any, AsyncIterator, Optional
 
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from ...agents.ingestion_queue import IngestionQueue
 from ...agents.learning_engine import LearningEngine
 from ...agents.profile_agent import ProfileAgent
-from ...models.persona import LearningSignal, PersonaResponse, PersonaUpdateRequest
-from ...utils.supabase_client import get_supabase
+from ...models.persona import (
+    IngestionJobResponse,
+    LearningSignal,
+    NoteMatch,
+    NoteSearchResponse,
+    Persona,
+    PersonaBatchGetRequest,
+    PersonaBatchLearnRequest,
+    PersonaNotesPage,
+    PersonaResponse,
+    PersonaUpdateRequest,
+)
+from ...utils.change_feed import get_change_hub
+from ...utils.config import get_settings
+from ...utils.deadlines import Deadline
+from ...utils.note_index import get_note_index_store
+from ...utils.persona_cache import CachedPersona, get_persona_cache
+from ...utils.persona_export import EXPORT_COLUMNS, MEDIA_TYPES, encode, iter_pages, validate_export
+from ...utils.persona_store import PersonaStore, get_persona_store
 
 router = APIRouter()
-learning_engine = LearningEngine()
-profile_agent = ProfileAgent(learning_engine=learning_engine)
+_profile_agent: Optional[ProfileAgent] = None
+_ingestion_queue: Optional[IngestionQueue] = None
+
+
+def get_profile_agent() -> ProfileAgent:
+    global _profile_agent
+    if _profile_agent:
+        return _profile_agent
+
+    _profile_agent = ProfileAgent(learning_engine=LearningEngine())
+    return _profile_agent
+
+
+def get_ingestion_queue() -> IngestionQueue:
+    global _ingestion_queue
+    if _ingestion_queue:
+        return _ingestion_queue
+
+    _ingestion_queue = IngestionQueue(profile_agent=get_profile_agent())
+    return _ingestion_queue
 
 
 @router.post("/learn", response_model=PersonaResponse)
-async def learn(request: PersonaUpdateRequest) -> PersonaResponse:
-    supabase = get_supabase()
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Supabase client not configured")
+async def learn(
+    request: PersonaUpdateRequest, x_deadline_ms: int | None = Header(default=None, ge=1)
+) -> Response:
+    store = _require_store()
+
+    persona = await get_profile_agent().learn(request, store, deadline=_deadline(x_deadline_ms))
+    return _json(PersonaResponse(persona=persona, message="Persona updated"))
+
+
+@router.post("/learn/stream")
+async def learn_stream(
+    request: PersonaUpdateRequest, x_deadline_ms: int | None = Header(default=None, ge=1)
+) -> StreamingResponse:
+    """Server-Sent Events variant of ``/learn``.
+
+    Emits a ``summary`` event per analyzed signal, ``synthesis`` events carrying merge
+    text deltas, then ``persona`` with the persisted result (or ``error``).
+    """
+    store = _require_store()
+    deadline = _deadline(x_deadline_ms)
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for event, data in get_profile_agent().learn_stream(request, store, deadline):
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _deadline(header_ms: int | None) -> Deadline | None:
+    # X-Deadline-Ms overrides the configured budget; a zero setting means no deadline.
+    seconds = header_ms / 1000 if header_ms else get_settings().learn_deadline_seconds
+    return Deadline(seconds) if seconds > 0 else None
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + to_json(data, fallback=str) + b"\n\n"
+
+
+@router.post("/learn:batch")
+async def learn_batch(batch: PersonaBatchLearnRequest) -> StreamingResponse:
+    """Learn many personas, streaming one NDJSON line per user as each is persisted."""
+    store = _require_store()
+
+    results = get_profile_agent().learn_many(
+        batch.requests, store=store, max_concurrency=batch.max_concurrency
+    )
+    return StreamingResponse(_ndjson(results), media_type="application/x-ndjson")
+
+
+@router.post(":batchGet")
+async def batch_get(batch: PersonaBatchGetRequest) -> StreamingResponse:
+    """Fetch many personas, streaming one NDJSON line per requested user."""
+    unknown = set(batch.fields or []) - set(Persona.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+    store = _require_store()
+
+    async def results() -> AsyncIterator[dict[str, Any]]:
+        cache = get_persona_cache()
+        user_ids = list(dict.fromkeys(batch.user_ids))
+        missing: list[str] = []
+        for user_id in user_ids:
+            entry = cache.get(user_id)
+            if entry is None:
+                missing.append(user_id)
+            else:
+                yield {"user_id": user_id, "status": "ok", "persona": entry.project(batch.fields)}
+
+        chunk_size = get_settings().persona_batch_chunk_size
+        for i in range(0, len(missing), chunk_size):
+            chunk = missing[i : i + chunk_size]
+            generation = cache.generation()
+            try:
+                personas = await store.get_many(chunk)
+            except Exception as e:
+                for user_id in chunk:
+                    yield {"user_id": user_id, "status": "error", "error": str(e)}
+                continue
+            for user_id in chunk:
+                if user_id not in personas:
+                    yield {"user_id": user_id, "status": "not_found"}
+                    continue
+                entry = cache.put(user_id, personas[user_id], generation)
+                yield {"user_id": user_id, "status": "ok", "persona": entry.project(batch.fields)}
+
+    return StreamingResponse(_ndjson(results()), media_type="application/x-ndjson")
+
 
-    persona = await learning_engine.process_signals(
-        user_id=request.user_id, signals=request.signals, feedback=request.feedback
+@router.get(":export")
+async def export_personas(
+    format: str = "ndjson",
+    fields: str | None = None,
+    since: str | None = None,
+    compression: str | None = None,
+    page_size: int | None = Query(None, ge=1, le=10000),
+) -> StreamingResponse:
+    """Stream every persona (or those updated at or after ``since``) for bulk analytics.
+
+    Pages through the table by ``(updated_at, user_id)`` and writes each page as it
+    arrives: NDJSON (optionally gzipped), Parquet or an Arrow IPC stream.
+    """
+    columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else []
+    columns = columns or list(EXPORT_COLUMNS)
+    try:
+        validate_export(format, columns, compression, since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format != "ndjson":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as e:
+            # Also raised for an installed pyarrow built against another NumPy major.
+            raise HTTPException(
+                status_code=501, detail=f"{format} export needs pyarrow>=14,<18: {e}"
+            )
+    store = _require_store()
+
+    pages = iter_pages(
+        store, columns, since, page_size or get_settings().persona_export_page_size
+    )
+    gzipped = format == "ndjson" and compression == "gzip"
+    filename = f"personas.{format}" + (".gz" if gzipped else "")
+    return StreamingResponse(
+        encode(pages, format, columns, compression),
+        media_type="application/gzip" if gzipped else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def _ndjson(results: AsyncIterator[dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for result in results:
+        yield to_json(result, fallback=str) + b"\n"
+
+
+@router.post("/learn/async", response_model=IngestionJobResponse, status_code=202)
+async def learn_async(request: PersonaUpdateRequest) -> IngestionJobResponse:
+    try:
+        job = get_ingestion_queue().submit(request)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Ingestion queue is full")
+    return IngestionJobResponse(**job.as_dict())
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_job(job_id: str) -> IngestionJobResponse:
+    job = get_ingestion_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return IngestionJobResponse(**job.as_dict())
+
+
+@router.get("/changes")
+async def persona_changes(user_ids: str = Query(..., min_length=1)) -> StreamingResponse:
+    """Server-Sent Events feed of writes to the comma-separated ``user_ids``.
+
+    Each ``persona`` event holds the fields that changed, plus ``etag`` and ``base_etag``;
+    a client whose copy is not at ``base_etag`` (or that gets ``resync``) refetches.
+    Nothing touches the database while no writes happen.
+    """
+    settings = get_settings()
+    ids = list(dict.fromkeys(u.strip() for u in user_ids.split(",") if u.strip()))
+    if not ids or len(ids) > settings.persona_feed_max_user_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Subscribe to 1-{settings.persona_feed_max_user_ids} user_ids",
+        )
+
+    async def events() -> AsyncIterator[bytes]:
+        changes = get_change_hub().subscribe(ids)
+        pending = asyncio.ensure_future(anext(changes))
+        try:
+            yield _sse("subscribed", {"user_ids": ids})
+            while True:
+                done, _ = await asyncio.wait(
+                    {pending}, timeout=settings.persona_feed_heartbeat_seconds
+                )
+                if not done:
+                    # Comment line; keeps proxies from timing out an idle stream.
+                    yield b": ping\n\n"
+                    continue
+                change = pending.result()
+                pending = asyncio.ensure_future(anext(changes))
+                yield _sse(change["type"], change)
+        finally:
+            pending.cancel()
+            await changes.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{user_id}/notes", response_model=PersonaNotesPage)
+async def get_notes(
+    user_id: str, cursor: str | None = None, limit: int = Query(50, ge=1, le=500)
+) -> PersonaNotesPage:
+    """Page through a persona's append-only notes, oldest first."""
+    try:
+        notes, next_cursor = await get_profile_agent().load_notes(
+            user_id, store=_require_store(), cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PersonaNotesPage(user_id=user_id, notes=notes, next_cursor=next_cursor)
+
+
+@router.get("/{user_id}/search", response_model=NoteSearchResponse)
+async def search_notes(
+    user_id: str, q: str = Query(..., min_length=1), k: int = Query(5, ge=1, le=100)
+) -> NoteSearchResponse:
+    """Rank a persona's notes against ``q`` with the local embedding index (no LLM call)."""
+    entry = await _read_through(user_id)
+    indexes = get_note_index_store()
+    index = indexes.get(user_id, entry.etag)
+    if index is None:
+        notes = await _require_store().recent_notes(
+            user_id, limit=get_settings().note_index_max_notes
+        )
+        index = indexes.put(user_id, entry.etag, notes)
+    return NoteSearchResponse(
+        user_id=user_id,
+        query=q,
+        results=[NoteMatch(score=score, note=note) for score, note in index.search(q, k)],
     )
-    await profile_agent.persist_persona(user_id=request.user_id, persona=persona, supabase=supabase)
-    return PersonaResponse(persona=persona, message="Persona updated")
 
 
 @router.get("/{user_id}", response_model=PersonaResponse)
-async def get_persona(user_id: str) -> PersonaResponse:
-    supabase = get_supabase()
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Supabase client not configured")
+async def get_persona(user_id: str, request: Request, fields: str | None = None) -> Response:
+    """The stored persona; ``notes`` is always empty here, page them via ``/notes``."""
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    unknown = set(selected or []) - set(Persona.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+
+    entry = await _read_through(user_id)
+    etag = entry.etag_for(selected)
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match == "*":
+        return Response(status_code=304, headers={"ETag": etag})
+    body = PersonaResponse(persona=entry.persona, message="Persona fetched")
+    include = {"persona": {"user_id", *selected}, "message": True} if selected else None
+    return _json(body, include=include, headers={"ETag": etag})
 
-    result = supabase.table("personas").select("*").eq("user_id", user_id).execute()
-    records = result.data or []
-    if not records:
+
+async def _read_through(user_id: str) -> CachedPersona:
+    cache = get_persona_cache()
+    entry = cache.get(user_id)
+    if entry is not None:
+        return entry
+
+    # Taken before the read so a write that lands meanwhile keeps this row out of the cache.
+    generation = cache.generation()
+    persona = await _require_store().get(user_id)
+    if persona is None:
         raise HTTPException(status_code=404, detail="Persona not found")
-    return PersonaResponse(persona=records[0], message="Persona fetched")
+    return cache.put(user_id, persona, generation)
 
+
+def _json(model: BaseModel, include: Any = None, headers: dict[str, str] | None = None) -> Response:
+    # Models built from validated instances serialize straight to bytes; returning them
+    # as-is would make FastAPI validate the whole persona again against response_model.
+    return Response(
+        model.model_dump_json(include=include), media_type="application/json", headers=headers
+    )
+
+
+def _require_store() -> PersonaStore:
+    store = get_persona_store()
+    if not store:
+        raise HTTPException(status_code=500, detail="Supabase client not configured")
+    return store
@@ -0,0 +1,60 @@
+"""Export personas straight from Supabase, without going through the HTTP API.
+
+Pages through the ``personas`` table by ``(updated_at, user_id)`` and writes each page
+as it arrives, so memory stays flat however many rows there are::
+
+    python -m backend.export --out personas.ndjson.gz --compression gzip
+    python -m backend.export --format parquet --fields user_id,traits --since 2026-01-01
+"""
+import argparse
+import asyncio
+import sys
+
+from .utils.config import get_settings
+from .utils.persona_export import EXPORT_COLUMNS, MEDIA_TYPES, encode, iter_pages, validate_export
+from .utils.persona_store import get_persona_store
+from .utils.supabase_client import close_async_postgrest
+
+
+async def export(args: argparse.Namespace) -> int:
+    columns = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else []
+    columns = columns or list(EXPORT_COLUMNS)
+    validate_export(args.format, columns, args.compression, args.since)
+    store = get_persona_store()
+    if not store:
+        raise SystemExit("Supabase client not configured")
+
+    pages = iter_pages(store, columns, args.since, args.page_size)
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    written = 0
+    try:
+        async for chunk in encode(pages, args.format, columns, args.compression):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        await close_async_postgrest()
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--format", choices=sorted(MEDIA_TYPES), default="ndjson")
+    parser.add_argument("--fields", help=f"Comma-separated subset of {','.join(EXPORT_COLUMNS)}")
+    parser.add_argument("--since", help="Only personas updated at or after this ISO timestamp")
+    parser.add_argument(
+        "--compression", help="gzip (ndjson); snappy, zstd or gzip (parquet); zstd or lz4 (arrow)"
+    )
+    parser.add_argument("--page-size", type=int, default=get_settings().persona_export_page_size)
+    parser.add_argument("--out", default="-", help="Output path, or - for stdout")
+    args = parser.parse_args()
+    try:
+        written = asyncio.run(export(args))
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Wrote {written} bytes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
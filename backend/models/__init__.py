@@ -1,4 +1,32 @@
-from .persona import LearningSignal, Persona, PersonaResponse, PersonaUpdateRequest
+from .persona import (
+    NOTE_ROWS,
+    PERSONA_ROWS,
+    IngestionJobResponse,
+    LearningSignal,
+    NoteMatch,
+    NoteSearchResponse,
+    Persona,
+    PersonaBatchGetRequest,
+    PersonaBatchLearnRequest,
+    PersonaNote,
+    PersonaNotesPage,
+    PersonaResponse,
+    PersonaUpdateRequest,
+)
 
-__all__ = ["LearningSignal", "Persona", "PersonaResponse", "PersonaUpdateRequest"]
+__all__ = [
+    "NOTE_ROWS",
+    "PERSONA_ROWS",
+    "IngestionJobResponse",
+    "LearningSignal",
+    "NoteMatch",
+    "NoteSearchResponse",
+    "Persona",
+    "PersonaBatchGetRequest",
+    "PersonaBatchLearnRequest",
+    "PersonaNote",
+    "PersonaNotesPage",
+    "PersonaResponse",
+    "PersonaUpdateRequest",
+]
 
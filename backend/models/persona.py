@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from collections import Counter
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from pydantic.dataclasses import dataclass
 
 
 class LearningSignal(BaseModel):
@@ -10,22 +12,111 @@ class LearningSignal(BaseModel):
     payload: dict[str, Any] = Field(default_factory=dict)
 
 
+@dataclass(slots=True, frozen=True)
+class PersonaNote:
+    """One learned note; slotted since a persona can carry thousands of them."""
+
+    type: str = "note"
+    summary: str = ""
+    id: int | None = None
+    created_at: str | None = None
+
+
 class Persona(BaseModel):
     user_id: str
     traits: list[Any] = Field(default_factory=list)
     preferences: list[Any] = Field(default_factory=list)
     interests: list[Any] = Field(default_factory=list)
     risks: list[Any] = Field(default_factory=list)
-    notes: list[Any] = Field(default_factory=list)
+    notes: list[PersonaNote] = Field(default_factory=list)
+    features: dict[str, Any] = Field(
+        default_factory=dict, description="Statistics computed locally from numeric signals"
+    )
+    version: int = 0
+    missing_signals: list[str] = Field(
+        default_factory=list,
+        description="Signal types (or 'synthesis') cut off by the request deadline; not stored",
+    )
+    signal_fingerprints: list[str] = Field(
+        default_factory=list,
+        exclude=True,
+        description="Signals analyzed by this update; marked seen once it is persisted",
+    )
+
+
+# Built once: validating Supabase rows through these skips per-call schema setup.
+PERSONA_ROWS = TypeAdapter(list[Persona])
+NOTE_ROWS = TypeAdapter(list[PersonaNote])
 
 
 class PersonaUpdateRequest(BaseModel):
     user_id: str
     signals: list[LearningSignal]
     feedback: str | None = None
+    max_concurrency: int | None = Field(
+        default=None, ge=1, description="Per-request cap on concurrently analyzed signals"
+    )
+    incremental: bool = Field(
+        default=False, description="Merge into the stored persona instead of replacing it"
+    )
+    batched: bool | None = Field(
+        default=None, description="Pack small signals into one structured Gemini call"
+    )
 
 
 class PersonaResponse(BaseModel):
-    persona: dict[str, Any] | Persona
+    persona: Persona
     message: str = "ok"
 
+
+class PersonaBatchLearnRequest(BaseModel):
+    requests: list[PersonaUpdateRequest] = Field(..., min_length=1)
+    max_concurrency: int | None = Field(
+        default=None, ge=1, description="Cap on personas learned at the same time"
+    )
+
+    @field_validator("requests")
+    @classmethod
+    def _one_request_per_user(
+        cls, requests: list[PersonaUpdateRequest]
+    ) -> list[PersonaUpdateRequest]:
+        # Two learns for one user in a batch would both build on the same stored version.
+        counts = Counter(r.user_id for r in requests)
+        duplicates = sorted(uid for uid, count in counts.items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate user_ids in batch: {duplicates}")
+        return requests
+
+
+class PersonaBatchGetRequest(BaseModel):
+    user_ids: list[str] = Field(..., min_length=1)
+    fields: list[str] | None = None
+
+
+class NoteMatch(BaseModel):
+    score: float
+    note: PersonaNote
+
+
+class NoteSearchResponse(BaseModel):
+    user_id: str
+    query: str
+    results: list[NoteMatch]
+
+
+class PersonaNotesPage(BaseModel):
+    user_id: str
+    notes: list[PersonaNote]
+    next_cursor: str | None = None
+
+
+class IngestionJobResponse(BaseModel):
+    job_id: str
+    user_id: str
+    status: str
+    coalesced: int = 1
+    error: str | None = None
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+
@@ -1,6 +1,15 @@
 from .config import get_settings
-from .gemini_client import get_gemini_client
-from .supabase_client import get_supabase
+from .gemini_client import get_async_gemini_client, get_gemini_client, get_rate_limiter
+from .persona_store import get_persona_store
+from .supabase_client import get_async_postgrest, get_supabase
 
-__all__ = ["get_settings", "get_gemini_client", "get_supabase"]
+__all__ = [
+    "get_settings",
+    "get_async_gemini_client",
+    "get_async_postgrest",
+    "get_gemini_client",
+    "get_persona_store",
+    "get_rate_limiter",
+    "get_supabase",
+]
 
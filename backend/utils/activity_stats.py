@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# NumPy is imported inside the functions that use it: it costs ~70 ms at process start
+# and is only needed once a numeric signal arrives.
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+DONE_STATUSES = {"done", "completed", "complete", "closed", "resolved", "finished"}
+
+_RECEIVED_KEYS = ("received", "received_at", "requested_at", "start")
+_RESPONDED_KEYS = ("responded", "responded_at", "replied_at", "sent_at", "end")
+
+
+def _epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Millisecond epochs are common in client payloads.
+        return float(value) / 1000 if value > 1e11 else float(value)
+    elif isinstance(value, str) and value:
+        try:
+            moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return math.nan
+    else:
+        return math.nan
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def to_epoch(values: Iterable[Any]) -> np.ndarray:
+    """Timestamps (ISO strings, epoch s/ms, datetimes) as float seconds; NaN if unparseable."""
+    import numpy as np
+
+    return np.fromiter((_epoch(v) for v in values), dtype=np.float64)
+
+
+def _first(item: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    return next((item[key] for key in keys if item.get(key) is not None), None)
+
+
+def _hours_and_days(
+    seconds: np.ndarray, utc_offset_minutes: int
+) -> tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    local = seconds + utc_offset_minutes * 60
+    hours = (local // 3600 % 24).astype(np.int64)
+    # 1970-01-01 was a Thursday (index 3 with Monday = 0).
+    days = ((local // 86400 + 3) % 7).astype(np.int64)
+    return hours, days
+
+
+def _peak_hours(hours: np.ndarray, top: int = 3) -> list[int]:
+    import numpy as np
+
+    counts = np.bincount(hours, minlength=24)
+    order = np.argsort(-counts, kind="stable")[:top]
+    return [int(h) for h in order if counts[h]]
+
+
+def _round(value: float, digits: int = 2) -> Optional[float]:
+    return None if math.isnan(value) else round(float(value), digits)
+
+
+def response_time_features(
+    timeline: list[Any], utc_offset_minutes: int = 0
+) -> dict[str, Any]:
+    """Reply-latency distribution and when replies happen.
+
+    ``timeline`` items are either ``{received, responded}`` pairs or bare timestamps; for
+    bare timestamps the gaps between consecutive activity are used instead.
+    """
+    import numpy as np
+
+    if timeline and all(isinstance(item, dict) for item in timeline):
+        received = to_epoch(_first(item, _RECEIVED_KEYS) for item in timeline)
+        responded = to_epoch(_first(item, _RESPONDED_KEYS) for item in timeline)
+        latency = responded - received
+        valid = ~np.isnan(latency) & (latency >= 0)
+        latency, moments = latency[valid], responded[valid]
+    else:
+        moments = np.sort(to_epoch(timeline))
+        moments = moments[~np.isnan(moments)]
+        latency = np.diff(moments)
+    if not latency.size:
+        return {"count": 0}
+
+    minutes = latency / 60
+    p50, p90 = np.percentile(minutes, [50, 90])
+    hours, days = _hours_and_days(moments, utc_offset_minutes)
+    return {
+        "count": int(latency.size),
+        "median_minutes": _round(p50, 1),
+        "p90_minutes": _round(p90, 1),
+        "within_1h_share": _round(np.mean(minutes <= 60)),
+        "within_24h_share": _round(np.mean(minutes <= 24 * 60)),
+        "peak_hours": _peak_hours(hours),
+        "weekend_share": _round(np.mean(days >= 5)) if days.size else None,
+    }
+
+
+def calendar_features(
+    events: list[dict[str, Any]], utc_offset_minutes: int = 0
+) -> dict[str, Any]:
+    """Meeting density, durations, time-of-day profile and back-to-back load."""
+    import numpy as np
+
+    starts = to_epoch(event.get("start") for event in events)
+    ends = to_epoch(event.get("end") for event in events)
+    valid = ~np.isnan(starts)
+    starts, ends = starts[valid], ends[valid]
+    if not starts.size:
+        return {"events": 0}
+
+    order = np.argsort(starts)
+    starts, ends = starts[order], ends[order]
+    durations = (ends - starts) / 60
+    durations = durations[~np.isnan(durations) & (durations >= 0)]
+    hours, days = _hours_and_days(starts, utc_offset_minutes)
+    local_days = (starts + utc_offset_minutes * 60) // 86400
+    active_days = np.unique(local_days).size
+    span_weeks = max(1.0, (local_days.max() - local_days.min() + 1) / 7)
+    gaps = starts[1:] - ends[:-1]
+    gaps = gaps[~np.isnan(gaps)]
+    return {
+        "events": int(starts.size),
+        "events_per_active_day": _round(starts.size / active_days, 1),
+        "median_duration_minutes": _round(np.median(durations), 0) if durations.size else None,
+        "hours_per_week": _round(durations.sum() / 60 / span_weeks, 1) if durations.size else None,
+        "peak_hours": _peak_hours(hours),
+        "busiest_weekday": WEEKDAYS[int(np.bincount(days, minlength=7).argmax())],
+        "early_share": _round(np.mean(hours < 9)),
+        "late_share": _round(np.mean(hours >= 18)),
+        "back_to_back_share": _round(np.mean((gaps >= 0) & (gaps <= 300))) if gaps.size else 0.0,
+    }
+
+
+def task_features(tasks: list[dict[str, Any]]) -> dict[str, Any]:
+    """Completion rate, status mix, cycle time and on-time delivery."""
+    import numpy as np
+
+    if not tasks:
+        return {"tasks": 0}
+
+    statuses = np.array([str(task.get("status") or "open").strip().lower() for task in tasks])
+    done = np.isin(statuses, list(DONE_STATUSES))
+    labels, counts = np.unique(statuses, return_counts=True)
+    created = to_epoch(task.get("created_at") for task in tasks)
+    completed = to_epoch(task.get("completed_at") for task in tasks)
+    due = to_epoch(task.get("due") or task.get("due_at") for task in tasks)
+
+    cycle_days = (completed - created) / 86400
+    cycle_days = cycle_days[done & ~np.isnan(cycle_days) & (cycle_days >= 0)]
+    judged = done & ~np.isnan(due) & ~np.isnan(completed)
+    now = datetime.now(timezone.utc).timestamp()
+    return {
+        "tasks": len(tasks),
+        "completion_rate": _round(np.mean(done)),
+        "status_counts": {str(label): int(count) for label, count in zip(labels, counts)},
+        "median_cycle_days": _round(np.median(cycle_days), 1) if cycle_days.size else None,
+        "on_time_rate": _round(np.mean(completed[judged] <= due[judged])) if judged.any() else None,
+        "overdue_open": int(np.sum(~done & ~np.isnan(due) & (due < now))),
+    }
+
+
+def describe(kind: str, features: dict[str, Any]) -> str:
+    """Plain bullet rendering of computed features, used as the signal's note."""
+    lines = [f"- {kind.replace('_', ' ')} statistics:"]
+    for key, value in features.items():
+        if value is None:
+            continue
+        if key == "peak_hours":
+            value = ", ".join(f"{h:02d}:00" for h in value) or "n/a"
+        elif key.endswith("_share") or key.endswith("_rate"):
+            value = f"{value:.0%}"
+        elif isinstance(value, dict):
+            value = ", ".join(f"{k} {v}" for k, v in value.items())
+        lines.append(f"  - {key.replace('_', ' ')}: {value}")
+    return "\n".join(lines)
@@ -0,0 +1,109 @@
+import asyncio
+from typing import Any, AsyncIterator, Iterable, Optional, Protocol
+
+from ..models.persona import Persona
+from .config import get_settings
+from .persona_cache import persona_etag
+
+Change = dict[str, Any]
+
+
+def stored_view(persona: Persona) -> Persona:
+    """The persona as ``GET /persona/{user_id}`` returns it once written."""
+    return persona.model_copy(
+        update={"notes": [], "missing_signals": [], "signal_fingerprints": []}
+    )
+
+
+def diff(before: Optional[dict[str, Any]], after: dict[str, Any]) -> dict[str, Any]:
+    """Top-level fields of ``after`` that differ from ``before`` (all of them without one)."""
+    if before is None:
+        return after
+    return {key: value for key, value in after.items() if before.get(key) != value}
+
+
+class ChangeHub(Protocol):
+    """Fan-out of persona writes to subscribers, keyed by ``user_id``.
+
+    Implementations backed by a broker (Redis pub/sub, Postgres LISTEN, ...) let writes in
+    one replica reach subscribers on another; the API only uses these two methods.
+    """
+
+    async def publish(self, persona: Persona) -> None: ...
+
+    def subscribe(self, user_ids: Iterable[str]) -> AsyncIterator[Change]: ...
+
+
+class InProcessChangeHub:
+    """``ChangeHub`` for a single process; writes for unwatched users cost one dict lookup.
+
+    Each event carries the fields that changed since the previous event for that user,
+    with ``etag``/``base_etag`` so a client whose copy is not at ``base_etag`` refetches
+    instead of applying the diff. A subscriber that falls ``queue_size`` events behind
+    gets a single ``resync`` event in place of its backlog and should refetch.
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue[Change]]] = {}
+        # Last published state per watched user, the base for the next diff.
+        self._last: dict[str, tuple[str, dict[str, Any]]] = {}
+
+    async def publish(self, persona: Persona) -> None:
+        queues = self._subscribers.get(persona.user_id)
+        if not queues:
+            return
+        view = stored_view(persona)
+        state = view.model_dump(mode="json", exclude={"notes", "missing_signals"})
+        etag = f'"{persona_etag(view)}"'
+        base_etag, before = self._last.get(persona.user_id, (None, None))
+        self._last[persona.user_id] = (etag, state)
+        change: Change = {
+            "type": "persona",
+            "user_id": persona.user_id,
+            "etag": etag,
+            "base_etag": base_etag,
+            "changes": diff(before, state),
+            "notes": persona.notes,
+        }
+        for queue in queues:
+            _offer(queue, change)
+
+    async def subscribe(self, user_ids: Iterable[str]) -> AsyncIterator[Change]:
+        user_ids = list(dict.fromkeys(user_ids))
+        queue: asyncio.Queue[Change] = asyncio.Queue(maxsize=self.queue_size)
+        for user_id in user_ids:
+            self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            for user_id in user_ids:
+                queues = self._subscribers.get(user_id)
+                if queues is None:
+                    continue
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+                    self._last.pop(user_id, None)
+
+
+def _offer(queue: "asyncio.Queue[Change]", change: Change) -> None:
+    try:
+        queue.put_nowait(change)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({"type": "resync"})
+
+
+_change_hub: Optional[ChangeHub] = None
+
+
+def get_change_hub() -> ChangeHub:
+    global _change_hub
+    if _change_hub:
+        return _change_hub
+
+    _change_hub = InProcessChangeHub(queue_size=get_settings().persona_feed_queue_size)
+    return _change_hub
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Optional
+
+from .config import get_settings
+
+REDUCE_PROMPT = (
+    "The following are partial analyses of consecutive parts of one larger input. "
+    "Combine them into a single deduplicated answer to the original task, keeping the "
+    "same format. Original task: "
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap prompt-size estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def chunk_text(text: str, max_tokens: int) -> list[str]:
+    """Split ``text`` into chunks of at most ``max_tokens``, preferring line boundaries."""
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    max_chars = max(1, max_tokens * 4)
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        # A single oversized line is hard-split so no chunk exceeds the budget.
+        pieces = [line[i : i + max_chars] for i in range(0, len(line), max_chars)] or [line]
+        for piece in pieces:
+            if size + len(piece) > max_chars and current:
+                chunks.append("".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+async def summarize_large(
+    client: Any,
+    prompt: str,
+    text: str,
+    chunk_tokens: Optional[int] = None,
+    fan_out: Optional[int] = None,
+) -> str:
+    """Map-reduce ``prompt`` over ``text`` when it exceeds one chunk.
+
+    Chunks are summarized in parallel, then partial summaries are combined ``fan_out`` at
+    a time until one remains, so latency grows with the tree depth rather than the input.
+    """
+    settings = get_settings()
+    chunk_tokens = chunk_tokens or settings.llm_chunk_tokens
+    fan_out = max(2, fan_out or settings.llm_reduce_fan_out)
+
+    chunks = chunk_text(text, chunk_tokens)
+    if len(chunks) == 1:
+        return await client.generate(prompt, text)
+
+    semaphore = asyncio.Semaphore(max(1, settings.llm_chunk_concurrency))
+
+    async def run(task_prompt: str, task_text: str) -> str:
+        async with semaphore:
+            return await client.generate(task_prompt, task_text)
+
+    partials = await asyncio.gather(*(run(prompt, chunk) for chunk in chunks))
+    reduce_prompt = REDUCE_PROMPT + prompt
+    while len(partials) > 1:
+        groups = [partials[i : i + fan_out] for i in range(0, len(partials), fan_out)]
+        partials = await asyncio.gather(
+            *(
+                run(reduce_prompt, "\n\n---\n\n".join(group)) if len(group) > 1 else _done(group[0])
+                for group in groups
+            )
+        )
+    return partials[0]
+
+
+async def _done(value: str) -> str:
+    return value
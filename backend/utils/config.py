@@ -11,6 +11,75 @@ class Settings(BaseSettings):
     supabase_anon_key: Optional[str] = Field(default=None, env="SUPABASE_ANON_KEY")
     gemini_api_key: Optional[str] = Field(default=None, env="GEMINI_API_KEY")
     gemini_model: str = Field(default="gemini-1.5-pro-002", env="GEMINI_MODEL")
+    gemini_fast_model: str = Field(default="gemini-1.5-flash-002", env="GEMINI_FAST_MODEL")
+    gemini_model_routes: str = Field(default="", env="GEMINI_MODEL_ROUTES")
+    gemini_escalation_enabled: bool = Field(default=True, env="GEMINI_ESCALATION_ENABLED")
+    gemini_executor_workers: int = Field(default=8, env="GEMINI_EXECUTOR_WORKERS")
+    ingestion_workers: int = Field(default=2, env="INGESTION_WORKERS")
+    ingestion_queue_size: int = Field(default=1000, env="INGESTION_QUEUE_SIZE")
+    ingestion_job_retention: int = Field(default=10000, env="INGESTION_JOB_RETENTION")
+    ingestion_drain_seconds: float = Field(default=10.0, env="INGESTION_DRAIN_SECONDS")
+    persona_batch_max_concurrency: int = Field(default=8, env="PERSONA_BATCH_MAX_CONCURRENCY")
+    persona_batch_chunk_size: int = Field(default=500, env="PERSONA_BATCH_CHUNK_SIZE")
+    persona_batch_flush_ms: int = Field(default=50, env="PERSONA_BATCH_FLUSH_MS")
+    signal_dedup_enabled: bool = Field(default=True, env="SIGNAL_DEDUP_ENABLED")
+    signal_dedup_window: int = Field(default=5000, env="SIGNAL_DEDUP_WINDOW")
+    signal_dedup_max_users: int = Field(default=10000, env="SIGNAL_DEDUP_MAX_USERS")
+    note_dedup_enabled: bool = Field(default=True, env="NOTE_DEDUP_ENABLED")
+    note_dedup_threshold: float = Field(default=0.9, env="NOTE_DEDUP_THRESHOLD")
+    note_context_limit: int = Field(default=200, env="NOTE_CONTEXT_LIMIT")
+    note_index_dim: int = Field(default=1024, env="NOTE_INDEX_DIM")
+    note_index_max_users: int = Field(default=1000, env="NOTE_INDEX_MAX_USERS")
+    note_index_max_notes: int = Field(default=5000, env="NOTE_INDEX_MAX_NOTES")
+    persona_cache_ttl_seconds: float = Field(default=60, env="PERSONA_CACHE_TTL_SECONDS")
+    persona_cache_max_entries: int = Field(default=10000, env="PERSONA_CACHE_MAX_ENTRIES")
+    llm_cache_enabled: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    llm_cache_ttl_seconds: float = Field(default=24 * 3600, env="LLM_CACHE_TTL_SECONDS")
+    llm_cache_max_entries: int = Field(default=2048, env="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_max_bytes: int = Field(default=32 * 1024 * 1024, env="LLM_CACHE_MAX_BYTES")
+    llm_cache_sqlite_path: Optional[str] = Field(default=None, env="LLM_CACHE_SQLITE_PATH")
+    gemini_requests_per_minute: float = Field(default=60, env="GEMINI_REQUESTS_PER_MINUTE")
+    gemini_tokens_per_minute: float = Field(default=1_000_000, env="GEMINI_TOKENS_PER_MINUTE")
+    gemini_max_concurrency: int = Field(default=16, env="GEMINI_MAX_CONCURRENCY")
+    gemini_min_concurrency: int = Field(default=1, env="GEMINI_MIN_CONCURRENCY")
+    gemini_max_retries: int = Field(default=4, env="GEMINI_MAX_RETRIES")
+    gemini_retry_base_delay: float = Field(default=0.5, env="GEMINI_RETRY_BASE_DELAY")
+    gemini_retry_max_delay: float = Field(default=20.0, env="GEMINI_RETRY_MAX_DELAY")
+    llm_chunk_tokens: int = Field(default=6000, env="LLM_CHUNK_TOKENS")
+    llm_reduce_fan_out: int = Field(default=8, env="LLM_REDUCE_FAN_OUT")
+    llm_chunk_concurrency: int = Field(default=4, env="LLM_CHUNK_CONCURRENCY")
+    tracing_enabled: bool = Field(default=False, env="TRACING_ENABLED")
+    learning_max_concurrency: int = Field(default=0, env="LEARNING_MAX_CONCURRENCY")
+    learning_batch_enabled: bool = Field(default=False, env="LEARNING_BATCH_ENABLED")
+    learning_batch_max_signals: int = Field(default=12, env="LEARNING_BATCH_MAX_SIGNALS")
+    learning_batch_max_chars: int = Field(default=4000, env="LEARNING_BATCH_MAX_CHARS")
+    local_analyzers_enabled: bool = Field(default=True, env="LOCAL_ANALYZERS_ENABLED")
+    learn_deadline_seconds: float = Field(default=60.0, env="LEARN_DEADLINE_SECONDS")
+    learn_synthesis_share: float = Field(default=0.3, env="LEARN_SYNTHESIS_SHARE")
+    hedge_enabled: bool = Field(default=True, env="HEDGE_ENABLED")
+    hedge_quantile: float = Field(default=0.95, env="HEDGE_QUANTILE")
+    hedge_min_samples: int = Field(default=20, env="HEDGE_MIN_SAMPLES")
+    hedge_window: int = Field(default=200, env="HEDGE_WINDOW")
+    persona_feed_queue_size: int = Field(default=100, env="PERSONA_FEED_QUEUE_SIZE")
+    persona_feed_heartbeat_seconds: float = Field(
+        default=15.0, env="PERSONA_FEED_HEARTBEAT_SECONDS"
+    )
+    persona_feed_max_user_ids: int = Field(default=100, env="PERSONA_FEED_MAX_USER_IDS")
+    persona_export_page_size: int = Field(default=1000, env="PERSONA_EXPORT_PAGE_SIZE")
+    persona_write_behind_enabled: bool = Field(default=False, env="PERSONA_WRITE_BEHIND_ENABLED")
+    persona_write_behind_interval: float = Field(default=1.0, env="PERSONA_WRITE_BEHIND_INTERVAL")
+    persona_write_behind_max_pending: int = Field(
+        default=500, env="PERSONA_WRITE_BEHIND_MAX_PENDING"
+    )
+    persona_write_behind_journal: Optional[str] = Field(
+        default=None, env="PERSONA_WRITE_BEHIND_JOURNAL"
+    )
+    persona_write_behind_fsync: bool = Field(default=False, env="PERSONA_WRITE_BEHIND_FSYNC")
+    supabase_pool_max_connections: int = Field(default=20, env="SUPABASE_POOL_MAX_CONNECTIONS")
+    supabase_pool_max_keepalive: int = Field(default=10, env="SUPABASE_POOL_MAX_KEEPALIVE")
+    supabase_keepalive_expiry: float = Field(default=30.0, env="SUPABASE_KEEPALIVE_EXPIRY")
+    supabase_timeout_seconds: float = Field(default=10.0, env="SUPABASE_TIMEOUT_SECONDS")
+    supabase_connect_timeout: float = Field(default=5.0, env="SUPABASE_CONNECT_TIMEOUT")
 
     class Config:
         env_file = ".env"
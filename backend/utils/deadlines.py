@@ -0,0 +1,90 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """Absolute point on the monotonic clock that a request must finish by."""
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def portion(self, share: float) -> "Deadline":
+        """A deadline ending after ``share`` of the time that is left on this one."""
+        return Deadline(self.remaining() * share)
+
+
+class LatencyWindow:
+    """Rolling window of recent latencies for one kind of call."""
+
+    def __init__(self, size: int, min_samples: int) -> None:
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        # Linear interpolation between the closest ranks, as numpy.quantile does.
+        ordered = sorted(self._samples)
+        position = q * (len(ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+async def hedge(
+    call: Callable[[], Awaitable[T]],
+    delay: Optional[float],
+    on_hedge: Optional[Callable[[], None]] = None,
+) -> T:
+    """Await ``call()``; if it is still running after ``delay``, race a second copy.
+
+    The first successful result wins and the loser is cancelled. Without a ``delay``
+    (not enough latency history yet) this is a plain await.
+    """
+    pending: set[asyncio.Future[T]] = {asyncio.ensure_future(call())}
+    try:
+        if delay is None:
+            return await next(iter(pending))
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return done.pop().result()
+        if on_hedge:
+            on_hedge()
+        pending.add(asyncio.ensure_future(call()))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def until(stream: AsyncIterator[T], deadline: Deadline) -> AsyncIterator[T]:
+    """Re-yield ``stream`` items, raising ``asyncio.TimeoutError`` once ``deadline`` passes."""
+    iterator = stream.__aiter__()
+    while True:
+        try:
+            item = await asyncio.wait_for(iterator.__anext__(), deadline.remaining())
+        except StopAsyncIteration:
+            return
+        yield item
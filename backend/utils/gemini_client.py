@@ -1,24 +1,326 @@
-from typing import Optional
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional
 
-import google.generativeai as genai
 from loguru import logger
 
+from .chunking import estimate_tokens
 from .config import get_settings
+from .llm_cache import TieredCache, get_llm_cache, make_cache_key
+from .metrics import (
+    CACHE_REQUESTS,
+    GEMINI_CALL_SECONDS,
+    GEMINI_ERRORS,
+    GEMINI_TOKENS,
+    MODEL_ESCALATIONS,
+    span,
+)
+from .rate_limiter import RateLimiter
 
-_gemini_client: Optional[genai.GenerativeModel] = None
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
+# Model tiers: ``strong`` is GEMINI_MODEL, ``fast`` is GEMINI_FAST_MODEL.
+TIERS = ("fast", "strong")
 
-def get_gemini_client() -> Optional[genai.GenerativeModel]:
-    global _gemini_client
-    if _gemini_client:
-        return _gemini_client
+# Route (signal type or agent) -> tier. Single-shot extraction runs on the fast tier;
+# open-ended reasoning and everything user-facing stays on the strong one. Routes not
+# listed here use the strong tier; GEMINI_MODEL_ROUTES overrides entries.
+DEFAULT_ROUTES: dict[str, str] = {
+    "chat": "strong",
+    "email_message": "fast",
+    "calendar": "fast",
+    "documents": "fast",
+    "social_profile": "fast",
+    "decision_history": "strong",
+    "tasks": "fast",
+    "response_time": "fast",
+    "sentiment": "fast",
+    "topic_interest": "fast",
+    "feedback_loop": "fast",
+    "batch": "fast",
+    "conversation": "fast",
+    "synthesis": "strong",
+    "profile": "strong",
+}
+
+_gemini_models: dict[str, "genai.GenerativeModel"] = {}
+_async_gemini_clients: dict[str, "AsyncGeminiClient"] = {}
+_routed_clients: dict[str, "RoutedGeminiClient"] = {}
+_rate_limiter: Optional[RateLimiter] = None
+_missing_key_logged = False
+
+
+@lru_cache(maxsize=8)
+def _route_overrides(spec: str) -> dict[str, str]:
+    overrides: dict[str, str] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, tier = item.partition("=")
+        if tier.strip() not in TIERS:
+            raise ValueError(f"Unknown model tier in GEMINI_MODEL_ROUTES: {item!r}")
+        overrides[route.strip()] = tier.strip()
+    return overrides
+
+
+def tier_for(route: str) -> str:
+    overrides = _route_overrides(get_settings().gemini_model_routes)
+    return overrides.get(route) or DEFAULT_ROUTES.get(route, "strong")
+
+
+def model_for(tier: str) -> str:
+    settings = get_settings()
+    return settings.gemini_fast_model if tier == "fast" else settings.gemini_model
+
+
+def get_gemini_client(model_name: Optional[str] = None) -> Optional["genai.GenerativeModel"]:
+    global _missing_key_logged
+    model_name = model_name or get_settings().gemini_model
+    if model_name in _gemini_models:
+        return _gemini_models[model_name]
 
     settings = get_settings()
     if not settings.gemini_api_key:
-        logger.warning("GEMINI_API_KEY not set; returning None client.")
+        # Agents resolve the client per call, so only warn the first time.
+        if not _missing_key_logged:
+            logger.warning("GEMINI_API_KEY not set; returning None client.")
+            _missing_key_logged = True
         return None
 
+    # The SDK pulls in grpc and the generated protos; only pay for that on first use.
+    import google.generativeai as genai
+
     genai.configure(api_key=settings.gemini_api_key)
-    _gemini_client = genai.GenerativeModel(settings.gemini_model)
-    return _gemini_client
+    _gemini_models[model_name] = genai.GenerativeModel(model_name)
+    return _gemini_models[model_name]
+
+
+class AsyncGeminiClient:
+    """Non-blocking facade over a GenerativeModel shared by every agent."""
+
+    def __init__(
+        self,
+        model: "genai.GenerativeModel",
+        max_workers: int,
+        cache: Optional[TieredCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        tier: str = "strong",
+    ) -> None:
+        self.model = model
+        self.tier = tier
+        self.cache = cache
+        self.limiter = limiter
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gemini"
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self.model.model_name
+
+    async def _cached(self, key: Optional[str]) -> Optional[str]:
+        if not key:
+            return None
+        value = await self.cache.aget(key)
+        CACHE_REQUESTS.inc("llm", "miss" if value is None else "hit")
+        return value
+
+    async def generate(self, prompt: str, text: str = "") -> str:
+        key = make_cache_key(self.model_name, prompt, text) if self.cache else None
+        cached = await self._cached(key)
+        if cached is not None:
+            return cached
+
+        result = await self._generate(prompt, text)
+        if key and result:
+            await self.cache.aset(key, result)
+        return result
+
+    async def stream(self, prompt: str, text: str = "") -> AsyncIterator[str]:
+        """Yield the response as text deltas; a cached response arrives as one delta."""
+        key = make_cache_key(self.model_name, prompt, text) if self.cache else None
+        cached = await self._cached(key)
+        if cached is not None:
+            yield cached
+            return
+
+        generate_async = getattr(self.model, "generate_content_async", None)
+        if generate_async is None:
+            result = await self._generate(prompt, text)
+            if key and result:
+                await self.cache.aset(key, result)
+            yield result
+            return
+
+        contents = f"{prompt}\n\n{text}"
+        parts: list[str] = []
+        start = time.perf_counter()
+        try:
+            # A partially streamed response cannot be retried, so streams only take a slot.
+            if self.limiter is None:
+                async for delta in self._stream_call(generate_async, contents):
+                    parts.append(delta)
+                    yield delta
+            else:
+                async with self.limiter.slot(estimate_tokens(contents)):
+                    async for delta in self._stream_call(generate_async, contents):
+                        parts.append(delta)
+                        yield delta
+        except Exception:
+            GEMINI_ERRORS.inc(self.tier, self.model_name)
+            raise
+        labels = (self.tier, self.model_name)
+        GEMINI_CALL_SECONDS.observe(time.perf_counter() - start, *labels, "stream")
+        GEMINI_TOKENS.observe(estimate_tokens(contents), *labels, "prompt")
+        GEMINI_TOKENS.observe(estimate_tokens("".join(parts)), *labels, "response")
+        if key and parts:
+            await self.cache.aset(key, "".join(parts))
+
+    @staticmethod
+    async def _stream_call(generate_async: Any, contents: str) -> AsyncIterator[str]:
+        response = await generate_async(contents, stream=True)
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final finish-reason chunk).
+                continue
+            if text:
+                yield text
+
+    async def _generate(self, prompt: str, text: str) -> str:
+        contents = f"{prompt}\n\n{text}"
+        start = time.perf_counter()
+        try:
+            with span(f"gemini.{self.model_name}"):
+                if self.limiter is None:
+                    response = await self._call(contents)
+                else:
+                    response = await self.limiter.call(
+                        lambda: self._call(contents),
+                        estimated_tokens=estimate_tokens(contents),
+                        actual_tokens=_total_tokens,
+                    )
+        except Exception:
+            GEMINI_ERRORS.inc(self.tier, self.model_name)
+            raise
+        labels = (self.tier, self.model_name)
+        GEMINI_CALL_SECONDS.observe(time.perf_counter() - start, *labels, "generate")
+        result = response.text or ""
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or estimate_tokens(contents)
+        response_tokens = getattr(usage, "candidates_token_count", 0) or estimate_tokens(result)
+        GEMINI_TOKENS.observe(prompt_tokens, *labels, "prompt")
+        GEMINI_TOKENS.observe(response_tokens, *labels, "response")
+        return result
+
+    async def _call(self, contents: str) -> Any:
+        generate_async = getattr(self.model, "generate_content_async", None)
+        if generate_async is not None:
+            return await generate_async(contents)
+        # Older SDKs only ship the blocking call; keep it off the event loop.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.model.generate_content, contents)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def _usable(text: str) -> bool:
+    return bool(text and text.strip())
+
+
+class RoutedGeminiClient:
+    """A route's view of its tier client; unusable output is retried on the strong tier."""
+
+    def __init__(
+        self, route: str, client: AsyncGeminiClient, escalation: Optional[AsyncGeminiClient]
+    ) -> None:
+        self.route = route
+        self.client = client
+        self.escalation = escalation
+
+    @property
+    def model_name(self) -> str:
+        return self.client.model_name
+
+    async def generate(
+        self, prompt: str, text: str = "", validate: Callable[[str], bool] = _usable
+    ) -> str:
+        result = await self.client.generate(prompt, text)
+        if self.escalation is None or validate(result):
+            return result
+        MODEL_ESCALATIONS.inc(self.route, self.client.tier, self.escalation.tier)
+        logger.info(f"Escalating '{self.route}' to {self.escalation.model_name}")
+        return await self.escalation.generate(prompt, text)
+
+    def stream(self, prompt: str, text: str = "") -> AsyncIterator[str]:
+        # Deltas are already on the wire by the time the output could be judged.
+        return self.client.stream(prompt, text)
+
+
+def _total_tokens(response: Any) -> int:
+    usage = getattr(response, "usage_metadata", None)
+    return int(getattr(usage, "total_token_count", 0) or 0)
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    if _rate_limiter:
+        return _rate_limiter
+
+    settings = get_settings()
+    _rate_limiter = RateLimiter(
+        requests_per_minute=settings.gemini_requests_per_minute,
+        tokens_per_minute=settings.gemini_tokens_per_minute,
+        max_concurrency=settings.gemini_max_concurrency,
+        min_concurrency=settings.gemini_min_concurrency,
+        max_retries=settings.gemini_max_retries,
+        base_delay=settings.gemini_retry_base_delay,
+        max_delay=settings.gemini_retry_max_delay,
+    )
+    return _rate_limiter
+
+
+def get_tier_client(tier: str) -> Optional[AsyncGeminiClient]:
+    if tier in _async_gemini_clients:
+        return _async_gemini_clients[tier]
+
+    model = get_gemini_client(model_for(tier))
+    if not model:
+        return None
+
+    _async_gemini_clients[tier] = AsyncGeminiClient(
+        model,
+        max_workers=get_settings().gemini_executor_workers,
+        cache=get_llm_cache(),
+        limiter=get_rate_limiter(),
+        tier=tier,
+    )
+    return _async_gemini_clients[tier]
+
+
+def get_async_gemini_client(route: str) -> Optional[RoutedGeminiClient]:
+    """Client for ``route`` (a signal type or agent name) on its configured model tier."""
+    if route in _routed_clients:
+        return _routed_clients[route]
+
+    tier = tier_for(route)
+    client = get_tier_client(tier)
+    if not client:
+        return None
+
+    escalation = None
+    if get_settings().gemini_escalation_enabled and model_for(tier) != model_for("strong"):
+        escalation = get_tier_client("strong")
+    _routed_clients[route] = RoutedGeminiClient(route, client, escalation)
+    return _routed_clients[route]
+
 
+def close_gemini_clients() -> None:
+    """Shut down every tier client's executor; clients are rebuilt on next use."""
+    for client in _async_gemini_clients.values():
+        client.close()
+    _async_gemini_clients.clear()
+    _routed_clients.clear()
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional, Protocol
+
+from loguru import logger
+
+from .config import get_settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def make_cache_key(model: str, prompt: str, text: str) -> str:
+    """Content address for a generation: model, prompt template and normalized payload."""
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    raw = json.dumps([model, prompt, normalized], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CacheBackend(Protocol):
+    stats: CacheStats
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str) -> None: ...
+
+
+class MemoryCache:
+    """In-process LRU bounded by entry count, total bytes and TTL."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.stats.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value.encode("utf-8"))
+
+
+class SQLiteCache:
+    """On-disk tier that survives restarts; expired rows are purged lazily."""
+
+    def __init__(self, path: str, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at < time.time():
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl_seconds),
+            )
+            self._conn.commit()
+
+
+class TieredCache:
+    """Memory first, then disk; disk hits are promoted back into memory.
+
+    ``aget``/``aset`` are the event-loop variants: disk reads run in a worker thread and
+    disk writes are queued on a single background writer, so SQLite never blocks the loop.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: Optional[SQLiteCache] = None) -> None:
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+        self._writer = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-cache")
+            if disk is not None
+            else None
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self._promote(key, self.disk.get(key))
+        return self._count(value)
+
+    async def aget(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self._promote(key, await asyncio.to_thread(self.disk.get, key))
+        return self._count(value)
+
+    def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    async def aset(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        if self._writer is not None:
+            self._writer.submit(self.disk.set, key, value).add_done_callback(_log_failed_write)
+
+    def _promote(self, key: str, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def _count(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        tiers = {"total": self.stats.as_dict(), "memory": self.memory.stats.as_dict()}
+        if self.disk is not None:
+            tiers["disk"] = self.disk.stats.as_dict()
+        return tiers
+
+
+def _log_failed_write(future: "Future[None]") -> None:
+    error = future.exception()
+    if error is not None:
+        logger.warning(f"LLM disk cache write failed: {error}")
+
+
+_llm_cache: Optional[TieredCache] = None
+
+
+def get_llm_cache() -> Optional[TieredCache]:
+    global _llm_cache
+    if _llm_cache:
+        return _llm_cache
+
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+
+    memory = MemoryCache(
+        max_entries=settings.llm_cache_max_entries,
+        max_bytes=settings.llm_cache_max_bytes,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+    )
+    disk = (
+        SQLiteCache(settings.llm_cache_sqlite_path, settings.llm_cache_ttl_seconds)
+        if settings.llm_cache_sqlite_path
+        else None
+    )
+    _llm_cache = TieredCache(memory, disk)
+    return _llm_cache
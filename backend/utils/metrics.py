@@ -0,0 +1,207 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name, self.help, self.label_names = name, help, labels
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name, self.help, self.label_names = name, help, labels
+        self.buckets = buckets
+        self._series: dict[LabelValues, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            # Layout: one cumulative count per bucket, then +Inf count, then sum.
+            series = self._series.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = _labels(self.label_names, labels, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                inf = _labels(self.label_names, labels, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf} {series[-2]}")
+                plain = _labels(self.label_names, labels)
+                lines.append(f"{self.name}_count{plain} {series[-2]}")
+                lines.append(f"{self.name}_sum{plain} {series[-1]}")
+        return lines
+
+
+class GaugeCallback:
+    """Gauge whose labelled values are read from a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...],
+        read: Callable[[], dict[LabelValues, float]],
+    ) -> None:
+        self.name, self.help, self.label_names, self.read = name, help, labels, read
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self.read().items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | GaugeCallback] = {}
+
+    def register(self, metric: Counter | Histogram | GaugeCallback) -> None:
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _counter(name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+    metric = Counter(name, help, labels)
+    registry.register(metric)
+    return metric
+
+
+def _histogram(
+    name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS
+) -> Histogram:
+    metric = Histogram(name, help, labels, buckets)
+    registry.register(metric)
+    return metric
+
+
+SIGNAL_HANDLER_SECONDS = _histogram(
+    "persona_signal_handler_seconds", "Learning signal handler latency", ("signal_type",)
+)
+SIGNAL_HANDLER_FAILURES = _counter(
+    "persona_signal_handler_failures_total", "Learning signal handler failures", ("signal_type",)
+)
+GEMINI_CALL_SECONDS = _histogram(
+    "persona_gemini_call_seconds", "Gemini generation latency", ("tier", "model", "mode")
+)
+GEMINI_TOKENS = _histogram(
+    "persona_gemini_tokens", "Gemini tokens per call", ("tier", "model", "kind"), TOKEN_BUCKETS
+)
+GEMINI_ERRORS = _counter(
+    "persona_gemini_errors_total", "Failed Gemini calls", ("tier", "model")
+)
+MODEL_ESCALATIONS = _counter(
+    "persona_model_escalations_total",
+    "Calls retried on a stronger tier after unusable output",
+    ("route", "from_tier", "to_tier"),
+)
+HTTP_REQUEST_SECONDS = _histogram(
+    "persona_http_request_seconds", "API request latency", ("method", "route", "status")
+)
+SUPABASE_QUERY_SECONDS = _histogram(
+    "persona_supabase_query_seconds", "Supabase query latency", ("table", "operation")
+)
+HEDGED_CALLS = _counter(
+    "persona_hedged_calls_total", "Signal handlers raced with a duplicate call", ("signal_type",)
+)
+DEADLINE_EXCEEDED = _counter(
+    "persona_deadline_exceeded_total", "Learn requests that ran out of budget", ("stage",)
+)
+CACHE_REQUESTS = _counter(
+    "persona_cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+)
+
+
+def register_gauge(
+    name: str, help: str, labels: tuple[str, ...], read: Callable[[], dict[LabelValues, float]]
+) -> None:
+    registry.register(GaugeCallback(name, help, labels, read))
+
+
+# --- Per-request trace spans -------------------------------------------------------
+
+_spans: ContextVar[Optional[list[tuple[str, float, float]]]] = ContextVar("spans", default=None)
+
+
+@contextmanager
+def trace() -> Iterator[list[tuple[str, float, float]]]:
+    """Collect ``(name, perf_counter start, duration)`` spans recorded in this context."""
+    spans: list[tuple[str, float, float]] = []
+    token = _spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _spans.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((name, start, time.perf_counter() - start))
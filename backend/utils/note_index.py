@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
+
+from ..models.persona import PersonaNote
+from .config import get_settings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# NumPy is imported inside the functions that use it: it costs ~70 ms at process start
+# and is only needed once notes are deduplicated or searched.
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def embed(texts: list[str], dim: int) -> np.ndarray:
+    """Hash word unigrams and bigrams into L2-normalized ``(len(texts), dim)`` vectors.
+
+    A local, dependency-free stand-in for a sentence encoder: good enough to catch
+    reworded near-duplicates and to rank notes by lexical overlap with a query.
+    """
+    import numpy as np
+
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = _TOKEN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not features:
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features)
+        )
+        signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+        np.add.at(vectors[row], (hashes >> 1) % dim, signs)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class NoteIndex:
+    """Cosine-similarity index over one user's note summaries."""
+
+    def __init__(self, dim: int) -> None:
+        import numpy as np
+
+        self.dim = dim
+        self.notes: list[PersonaNote] = []
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def add(self, notes: list[PersonaNote]) -> None:
+        import numpy as np
+
+        if not notes:
+            return
+        vectors = embed([note.summary for note in notes], self.dim)
+        self.notes.extend(notes)
+        self.vectors = np.vstack([self.vectors, vectors])
+
+    def search(self, query: str, k: int = 5) -> list[tuple[float, PersonaNote]]:
+        import numpy as np
+
+        if not self.notes:
+            return []
+        scores = self.vectors @ embed([query], self.dim)[0]
+        k = min(k, len(self.notes))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.notes[i]) for i in top]
+
+
+def dedupe_summaries(
+    summaries: list[str], existing: list[str], threshold: float, dim: int
+) -> list[bool]:
+    """Flag which ``summaries`` to keep.
+
+    A summary is dropped when its cosine similarity to an existing note or to an earlier
+    kept summary reaches ``threshold``.
+    """
+    import numpy as np
+
+    if not summaries:
+        return []
+    candidates = embed(summaries, dim)
+    kept = embed(existing, dim) if existing else np.zeros((0, dim), dtype=np.float32)
+    keep: list[bool] = []
+    for vector in candidates:
+        is_duplicate = bool(len(kept)) and float(np.max(kept @ vector)) >= threshold
+        keep.append(not is_duplicate)
+        if not is_duplicate:
+            kept = np.vstack([kept, vector[None, :]])
+    return keep
+
+
+class NoteIndexStore:
+    """LRU of per-user indexes, rebuilt when the persona row they came from changes."""
+
+    def __init__(self, dim: int, max_users: int) -> None:
+        self.dim = dim
+        self.max_users = max_users
+        self._indexes: OrderedDict[str, tuple[str, NoteIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, version: str) -> Optional[NoteIndex]:
+        with self._lock:
+            cached = self._indexes.get(user_id)
+            if cached and cached[0] == version:
+                self._indexes.move_to_end(user_id)
+                return cached[1]
+            return None
+
+    def put(self, user_id: str, version: str, notes: list[PersonaNote]) -> NoteIndex:
+        index = NoteIndex(self.dim)
+        index.add(notes)
+        with self._lock:
+            self._indexes[user_id] = (version, index)
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return index
+
+
+_note_index_store: Optional[NoteIndexStore] = None
+
+
+def get_note_index_store() -> NoteIndexStore:
+    global _note_index_store
+    if _note_index_store:
+        return _note_index_store
+
+    settings = get_settings()
+    _note_index_store = NoteIndexStore(
+        dim=settings.note_index_dim, max_users=settings.note_index_max_users
+    )
+    return _note_index_store
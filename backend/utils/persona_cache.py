@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from ..models.persona import Persona
+from .config import get_settings
+from .metrics import CACHE_REQUESTS
+
+
+@dataclass(frozen=True)
+class CachedPersona:
+    persona: Persona
+    etag: str
+    expires_at: float
+
+    def etag_for(self, fields: Optional[list[str]] = None) -> str:
+        """Strong ETag for the full row or for a projection of it."""
+        if not fields:
+            return f'"{self.etag}"'
+        digest = hashlib.sha256(f"{self.etag}:{','.join(fields)}".encode()).hexdigest()[:16]
+        return f'"{digest}"'
+
+    def project(self, fields: Optional[list[str]] = None) -> Persona | dict[str, Any]:
+        if not fields:
+            return self.persona
+        return self.persona.model_dump(mode="json", include={"user_id", *fields})
+
+
+def persona_etag(persona: Persona) -> str:
+    # Canonical JSON: JSONB hands back object keys (e.g. inside ``features``) in its own
+    # order, and the change feed must agree with GET on personas built in memory.
+    canonical = json.dumps(
+        persona.model_dump(mode="json"), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class PersonaCache:
+    """Read-through TTL cache of stored personas, invalidated on writes.
+
+    A read-through takes a ``generation()`` token before reading the store and passes it
+    to ``put``; if the user was invalidated in between, the (possibly stale) row is
+    returned to the caller but not cached.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedPersona] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Generation of each user's latest invalidation, bounded like the entries; any
+        # token below ``_floor`` may predate a forgotten invalidation.
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._floor = 0
+
+    def get(self, user_id: str) -> Optional[CachedPersona]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry.expires_at < time.monotonic():
+                del self._entries[user_id]
+                entry = None
+            CACHE_REQUESTS.inc("persona", "miss" if entry is None else "hit")
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+            return entry
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(
+        self, user_id: str, persona: Persona, generation: Optional[int] = None
+    ) -> CachedPersona:
+        entry = CachedPersona(
+            persona=persona,
+            etag=persona_etag(persona),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        with self._lock:
+            if generation is not None and (
+                generation < self._floor or generation < self._invalidated.get(user_id, 0)
+            ):
+                return entry
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+            self._invalidated[user_id] = self._generation
+            self._invalidated.move_to_end(user_id)
+            while len(self._invalidated) > self.max_entries:
+                _, forgotten = self._invalidated.popitem(last=False)
+                self._floor = forgotten
+
+
+_persona_cache: Optional[PersonaCache] = None
+
+
+def get_persona_cache() -> PersonaCache:
+    global _persona_cache
+    if _persona_cache:
+        return _persona_cache
+
+    settings = get_settings()
+    _persona_cache = PersonaCache(
+        ttl_seconds=settings.persona_cache_ttl_seconds,
+        max_entries=settings.persona_cache_max_entries,
+    )
+    return _persona_cache
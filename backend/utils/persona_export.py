@@ -0,0 +1,158 @@
+import io
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from pydantic_core import to_json
+
+from .persona_store import PersonaStore
+
+EXPORT_COLUMNS = (
+    "user_id",
+    "traits",
+    "preferences",
+    "interests",
+    "risks",
+    "features",
+    "version",
+    "updated_at",
+)
+# Free-form JSONB columns; columnar formats carry them as JSON text.
+JSON_COLUMNS = {"traits", "preferences", "interests", "risks", "features"}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+# Allowed ``compression`` per format: gzip wraps the NDJSON stream, the columnar
+# formats compress inside the file.
+COMPRESSIONS = {
+    "ndjson": {"gzip"},
+    "parquet": {"snappy", "zstd", "gzip"},
+    "arrow": {"zstd", "lz4"},
+}
+
+Row = dict[str, Any]
+
+
+def validate_export(
+    fmt: str, columns: list[str], compression: Optional[str], since: Optional[str]
+) -> None:
+    """Raise ``ValueError`` for an unknown format, column or compression, or a bad ``since``."""
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Unknown format {fmt!r}; use one of {sorted(MEDIA_TYPES)}")
+    unknown = set(columns) - set(EXPORT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {sorted(unknown)}")
+    if compression and compression not in COMPRESSIONS[fmt]:
+        raise ValueError(
+            f"Unsupported compression {compression!r} for {fmt}; "
+            f"use one of {sorted(COMPRESSIONS[fmt])}"
+        )
+    if since:
+        try:
+            datetime.fromisoformat(since)
+        except ValueError:
+            raise ValueError(f"Invalid since timestamp {since!r}; use ISO 8601") from None
+
+
+async def iter_pages(
+    store: PersonaStore, columns: list[str], since: Optional[str], page_size: int
+) -> AsyncIterator[list[Row]]:
+    """Every persona updated at or after ``since``, one keyset page at a time."""
+    after: Optional[tuple[str, str]] = None
+    while True:
+        rows = await store.export_page(columns, after=after, since=since, limit=page_size)
+        if not rows:
+            return
+        after = (rows[-1]["updated_at"], rows[-1]["user_id"])
+        yield [{column: row.get(column) for column in columns} for row in rows]
+        if len(rows) < page_size:
+            return
+
+
+async def encode(
+    pages: AsyncIterator[list[Row]], fmt: str, columns: list[str], compression: Optional[str]
+) -> AsyncIterator[bytes]:
+    """Serialize pages as they arrive; only one page is held in memory at a time."""
+    if fmt == "ndjson":
+        chunks = _ndjson(pages)
+        if compression == "gzip":
+            chunks = _gzip(chunks)
+    else:
+        chunks = _arrow(pages, fmt, columns, compression)
+    async for chunk in chunks:
+        if chunk:
+            yield chunk
+
+
+async def _ndjson(pages: AsyncIterator[list[Row]]) -> AsyncIterator[bytes]:
+    async for page in pages:
+        yield b"".join(to_json(row, fallback=str) + b"\n" for row in page)
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    async for chunk in chunks:
+        yield compressor.compress(chunk)
+    yield compressor.flush()
+
+
+class _Chunks(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last ``take``."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+async def _arrow(
+    pages: AsyncIterator[list[Row]], fmt: str, columns: list[str], compression: Optional[str]
+) -> AsyncIterator[bytes]:
+    # Optional dependency, only needed for the columnar formats.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "user_id": pa.string(),
+        "version": pa.int64(),
+        "updated_at": pa.timestamp("us", "UTC"),
+    }
+    schema = pa.schema([(column, types.get(column, pa.string())) for column in columns])
+    sink = _Chunks()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression=compression or "snappy")
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = pa.ipc.new_stream(sink, schema, options=options)
+    try:
+        async for page in pages:
+            # Each page becomes one row group / record batch.
+            writer.write_table(pa.Table.from_pydict(_columnar(page, columns), schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+def _columnar(page: list[Row], columns: list[str]) -> dict[str, list[Any]]:
+    data: dict[str, list[Any]] = {}
+    for column in columns:
+        values = [row[column] for row in page]
+        if column in JSON_COLUMNS:
+            values = [None if v is None else to_json(v).decode("utf-8") for v in values]
+        elif column == "updated_at":
+            values = [None if v is None else datetime.fromisoformat(v) for v in values]
+        data[column] = values
+    return data
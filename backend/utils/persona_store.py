@@ -0,0 +1,159 @@
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from ..models.persona import NOTE_ROWS, PERSONA_ROWS, Persona, PersonaNote
+from .config import get_settings
+from .supabase_client import execute, get_async_postgrest
+
+NOTE_COLUMNS = "id,type,summary,created_at"
+
+Row = dict[str, Any]
+
+
+def persona_row(persona: Persona) -> Row:
+    # Notes live in persona_notes; the personas row only carries synthesized state.
+    row = persona.model_dump(mode="json", exclude={"notes", "missing_signals"})
+    row["updated_at"] = datetime.now(timezone.utc).isoformat()
+    return row
+
+
+class PersonaStore:
+    """Typed async access to the ``personas`` and ``persona_notes`` tables.
+
+    ``client`` is anything exposing the postgrest ``table(...)`` builder; with the pooled
+    async client every call is awaited on the event loop over keep-alive connections.
+    """
+
+    def __init__(self, client: Any, chunk_size: int) -> None:
+        self.client = client
+        self.chunk_size = chunk_size
+
+    async def get(self, user_id: str) -> Optional[Persona]:
+        query = self.client.table("personas").select("*").eq("user_id", user_id).limit(1)
+        rows = (await execute(query, "personas", "select")).data or []
+        return PERSONA_ROWS.validate_python(rows)[0] if rows else None
+
+    async def get_many(self, user_ids: list[str]) -> dict[str, Persona]:
+        personas: dict[str, Persona] = {}
+        for i in range(0, len(user_ids), self.chunk_size):
+            chunk = user_ids[i : i + self.chunk_size]
+            query = self.client.table("personas").select("*").in_("user_id", chunk)
+            result = await execute(query, "personas", "select")
+            personas.update({p.user_id: p for p in PERSONA_ROWS.validate_python(result.data or [])})
+        return personas
+
+    async def upsert(self, persona: Persona) -> None:
+        query = self.client.table("personas").upsert(persona_row(persona), on_conflict="user_id")
+        await execute(query, "personas", "upsert")
+
+    async def upsert_many(self, personas: list[Persona]) -> None:
+        rows = [persona_row(persona) for persona in personas]
+        for i in range(0, len(rows), self.chunk_size):
+            query = self.client.table("personas").upsert(
+                rows[i : i + self.chunk_size], on_conflict="user_id"
+            )
+            await execute(query, "personas", "upsert")
+
+    async def export_page(
+        self,
+        columns: list[str],
+        after: Optional[tuple[str, str]],
+        since: Optional[str],
+        limit: int,
+    ) -> list[Row]:
+        """Raw rows ordered by ``(updated_at, user_id)``, strictly after the ``after`` key.
+
+        Rows are returned unvalidated for bulk export; ``updated_at`` and ``user_id`` are
+        always selected since they form the cursor.
+        """
+        selected = list(dict.fromkeys(["user_id", "updated_at", *columns]))
+        query = (
+            self.client.table("personas")
+            .select(",".join(selected))
+            .order("updated_at")
+            .order("user_id")
+            .limit(limit)
+        )
+        if since:
+            query = query.gte("updated_at", since)
+        if after:
+            updated_at, user_id = after
+            query = query.or_(
+                f'updated_at.gt."{updated_at}",'
+                f'and(updated_at.eq."{updated_at}",user_id.gt."{user_id}")'
+            )
+        return (await execute(query, "personas", "select")).data or []
+
+    async def insert_notes(self, notes: list[tuple[str, PersonaNote]]) -> None:
+        """Append ``(user_id, note)`` pairs; ids and timestamps are assigned by the DB."""
+        rows = [
+            {"user_id": user_id, "type": note.type, "summary": note.summary}
+            for user_id, note in notes
+        ]
+        for i in range(0, len(rows), self.chunk_size):
+            query = self.client.table("persona_notes").insert(rows[i : i + self.chunk_size])
+            await execute(query, "persona_notes", "insert")
+
+    async def recent_notes(self, user_id: str, limit: int) -> list[PersonaNote]:
+        """Newest ``limit`` notes for a user, returned oldest first."""
+        query = (
+            self.client.table("persona_notes")
+            .select(NOTE_COLUMNS)
+            .eq("user_id", user_id)
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(limit)
+        )
+        rows = (await execute(query, "persona_notes", "select")).data or []
+        return NOTE_ROWS.validate_python(rows[::-1])
+
+    async def notes_after(
+        self, user_id: str, after: Optional[tuple[str, int]], limit: int
+    ) -> list[PersonaNote]:
+        """Up to ``limit`` notes oldest first, strictly after the ``(created_at, id)`` key."""
+        query = (
+            self.client.table("persona_notes")
+            .select(NOTE_COLUMNS)
+            .eq("user_id", user_id)
+            .order("created_at")
+            .order("id")
+            .limit(limit)
+        )
+        if after:
+            created_at, note_id = after
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt.{note_id})'
+            )
+        rows = (await execute(query, "persona_notes", "select")).data or []
+        return NOTE_ROWS.validate_python(rows)
+
+
+_persona_store: Optional[PersonaStore] = None
+
+
+def get_persona_store() -> Optional[PersonaStore]:
+    global _persona_store
+    if _persona_store:
+        return _persona_store
+
+    client = get_async_postgrest()
+    if not client:
+        return None
+
+    settings = get_settings()
+    if not settings.persona_write_behind_enabled:
+        _persona_store = PersonaStore(client, chunk_size=settings.persona_batch_chunk_size)
+        return _persona_store
+
+    from .write_behind import WriteBehindStore
+
+    _persona_store = WriteBehindStore(
+        client,
+        chunk_size=settings.persona_batch_chunk_size,
+        interval=settings.persona_write_behind_interval,
+        max_pending=settings.persona_write_behind_max_pending,
+        journal_path=settings.persona_write_behind_journal,
+        fsync=settings.persona_write_behind_fsync,
+    )
+    return _persona_store
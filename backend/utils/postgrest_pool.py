@@ -0,0 +1,31 @@
+from typing import Any, Union
+
+import httpx
+from postgrest import AsyncPostgrestClient
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """Async PostgREST client whose HTTP session keeps a bounded keep-alive pool."""
+
+    def __init__(
+        self, base_url: str, headers: dict[str, str], limits: httpx.Limits, **kwargs: Any
+    ) -> None:
+        self._limits = limits
+        super().__init__(base_url, headers=headers, **kwargs)
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+        verify: bool = True,
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            limits=self._limits,
+            follow_redirects=True,
+            http2=True,
+        )
@@ -0,0 +1,181 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """True for quota (429) and transient server (5xx) failures worth retrying."""
+    code = getattr(error, "code", None)
+    if callable(code):
+        code = code()
+    code = getattr(code, "value", code)
+    if isinstance(code, int) and code in RETRYABLE_STATUS:
+        return True
+    return type(error).__name__ in {
+        "ResourceExhausted",
+        "TooManyRequests",
+        "ServiceUnavailable",
+        "InternalServerError",
+        "DeadlineExceeded",
+    }
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units evenly across each minute; acquirers wait their turn."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self._level = per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        # Requests larger than the bucket still go through once it is full.
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._level >= amount:
+                    self._level -= amount
+                    return
+                delay = (amount - self._level) / self.rate
+                self.waited_seconds += delay
+                await asyncio.sleep(delay)
+
+    def charge(self, amount: float) -> None:
+        """Debit usage discovered after the fact; the level may go negative."""
+        self._refill()
+        self._level -= amount
+
+
+class AdaptiveConcurrency:
+    """AIMD limiter: grow by ~1 slot per window of successes, halve on throttling."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self.waiting = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            self.waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+
+    async def release(self, throttled: bool) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(float(self.minimum), self.limit / 2)
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+@dataclass
+class LimiterStats:
+    requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    failures: int = 0
+
+
+class RateLimiter:
+    """Shared request/token quotas, adaptive concurrency and jittered retries."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = LimiterStats()
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        await self.concurrency.acquire()
+        throttled = False
+        try:
+            if self.requests:
+                await self.requests.acquire()
+            if self.tokens and estimated_tokens:
+                await self.tokens.acquire(estimated_tokens)
+            self.stats.requests += 1
+            yield
+        except BaseException as e:
+            throttled = is_throttle_error(e)
+            raise
+        finally:
+            await self.concurrency.release(throttled)
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        actual_tokens: Optional[Callable[[T], int]] = None,
+    ) -> T:
+        attempt = 0
+        while True:
+            try:
+                async with self.slot(estimated_tokens):
+                    result = await fn()
+            except Exception as e:
+                if not is_throttle_error(e):
+                    self.stats.failures += 1
+                    raise
+                self.stats.throttled += 1
+                if attempt >= self.max_retries:
+                    self.stats.failures += 1
+                    raise
+                # Full jitter keeps retrying callers from re-synchronizing on the quota edge.
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+                attempt += 1
+                self.stats.retries += 1
+                await asyncio.sleep(delay)
+                continue
+
+            if self.tokens and actual_tokens:
+                used = actual_tokens(result)
+                if used > estimated_tokens:
+                    self.tokens.charge(used - estimated_tokens)
+            return result
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            **asdict(self.stats),
+            "queue_depth": self.concurrency.waiting,
+            "in_flight": self.concurrency.in_flight,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "request_wait_seconds": self.requests.waited_seconds if self.requests else 0.0,
+            "token_wait_seconds": self.tokens.waited_seconds if self.tokens else 0.0,
+        }
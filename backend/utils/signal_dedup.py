@@ -0,0 +1,76 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from .config import get_settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def fingerprint(signal_type: str, payload: dict[str, Any]) -> str:
+    """Stable hash of a signal: key order and whitespace differences do not matter."""
+    raw = json.dumps(
+        [signal_type, _canonical(payload)],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SeenSignals:
+    """Per-user window of recently analyzed signal fingerprints."""
+
+    def __init__(self, window: int, max_users: int) -> None:
+        self.window = window
+        self.max_users = max_users
+        self._users: OrderedDict[str, OrderedDict[str, None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, user_id: str, fingerprints: Iterable[str]) -> set[str]:
+        with self._lock:
+            window = self._users.get(user_id)
+            if not window:
+                return set()
+            return {fp for fp in fingerprints if fp in window}
+
+    def mark(self, user_id: str, fingerprints: Iterable[str]) -> None:
+        with self._lock:
+            window = self._users.setdefault(user_id, OrderedDict())
+            self._users.move_to_end(user_id)
+            for fp in fingerprints:
+                window[fp] = None
+                window.move_to_end(fp)
+            while len(window) > self.window:
+                window.popitem(last=False)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+
+_seen_signals: Optional[SeenSignals] = None
+
+
+def get_seen_signals() -> SeenSignals:
+    global _seen_signals
+    if _seen_signals:
+        return _seen_signals
+
+    settings = get_settings()
+    _seen_signals = SeenSignals(
+        window=settings.signal_dedup_window, max_users=settings.signal_dedup_max_users
+    )
+    return _seen_signals
@@ -1,14 +1,22 @@
-from typing import Optional
+import asyncio
+import inspect
+from typing import TYPE_CHECKING, Any, Optional
 
 from loguru import logger
-from supabase import Client, create_client
 
 from .config import get_settings
+from .metrics import SUPABASE_QUERY_SECONDS, span
 
-_supabase: Optional[Client] = None
+if TYPE_CHECKING:
+    from supabase import Client
 
+    from .postgrest_pool import PooledPostgrestClient
 
-def get_supabase() -> Optional[Client]:
+_supabase: Optional["Client"] = None
+_async_postgrest: Optional["PooledPostgrestClient"] = None
+
+
+def get_supabase() -> Optional["Client"]:
     global _supabase
     if _supabase:
         return _supabase
@@ -18,6 +26,61 @@ def get_supabase() -> Optional[Client]:
         logger.warning("Supabase env vars missing; returning None client.")
         return None
 
+    from supabase import create_client
+
     _supabase = create_client(settings.supabase_url, settings.supabase_service_role_key)
     return _supabase
 
+
+def get_async_postgrest() -> Optional["PooledPostgrestClient"]:
+    global _async_postgrest
+    if _async_postgrest:
+        return _async_postgrest
+
+    settings = get_settings()
+    if not settings.supabase_url or not settings.supabase_service_role_key:
+        logger.warning("Supabase env vars missing; returning None client.")
+        return None
+
+    # httpx/postgrest are only needed once the data layer is actually used.
+    import httpx
+    from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+
+    from .postgrest_pool import PooledPostgrestClient
+
+    key = settings.supabase_service_role_key
+    _async_postgrest = PooledPostgrestClient(
+        f"{settings.supabase_url.rstrip('/')}/rest/v1",
+        headers={
+            **DEFAULT_POSTGREST_CLIENT_HEADERS,
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+        },
+        limits=httpx.Limits(
+            max_connections=settings.supabase_pool_max_connections,
+            max_keepalive_connections=settings.supabase_pool_max_keepalive,
+            keepalive_expiry=settings.supabase_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            settings.supabase_timeout_seconds, connect=settings.supabase_connect_timeout
+        ),
+    )
+    return _async_postgrest
+
+
+async def close_async_postgrest() -> None:
+    global _async_postgrest
+    if _async_postgrest:
+        await _async_postgrest.aclose()
+        _async_postgrest = None
+
+
+async def execute(query: Any, table: str, operation: str) -> Any:
+    """Run a built query without blocking the event loop, recording its latency.
+
+    Async builders are awaited directly; synchronous ones run on a worker thread.
+    """
+    with SUPABASE_QUERY_SECONDS.time(table, operation), span(f"supabase.{table}.{operation}"):
+        if inspect.iscoroutinefunction(query.execute):
+            return await query.execute()
+        return await asyncio.to_thread(query.execute)
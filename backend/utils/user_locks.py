@@ -0,0 +1,29 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class UserLocks:
+    """One ``asyncio.Lock`` per user, dropped again once nobody holds or awaits it."""
+
+    def __init__(self) -> None:
+        # user_id -> (lock, number of holders plus waiters)
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, user_id: str) -> AsyncIterator[None]:
+        lock, users = self._locks.get(user_id, (None, 0))
+        lock = lock or asyncio.Lock()
+        self._locks[user_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[user_id]
+            if users > 1:
+                self._locks[user_id] = (lock, users - 1)
+            else:
+                del self._locks[user_id]
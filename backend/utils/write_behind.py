@@ -0,0 +1,207 @@
+import asyncio
+import json
+import os
+from typing import Any, Optional
+
+from loguru import logger
+from pydantic_core import to_json
+
+from ..models.persona import NOTE_ROWS, Persona, PersonaNote
+from .change_feed import stored_view
+from .persona_store import PersonaStore
+
+
+class WriteBehindStore(PersonaStore):
+    """``PersonaStore`` that buffers writes and flushes them as multi-row batches.
+
+    Persona upserts keep only the latest state per user; notes are appended in order.
+    A flush runs every ``interval`` seconds, or sooner once ``max_pending`` writes are
+    buffered. Reads in this process see buffered personas immediately, and note reads
+    for a user with buffered notes flush first so the rows carry DB ids for paging.
+
+    With a ``journal_path`` every buffered write is also appended to a JSON-lines file
+    that is compacted after each flush and replayed on ``start`` after a crash.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        chunk_size: int,
+        interval: float,
+        max_pending: int,
+        journal_path: Optional[str] = None,
+        fsync: bool = False,
+    ) -> None:
+        super().__init__(client, chunk_size)
+        self.interval = interval
+        self.max_pending = max_pending
+        self.journal_path = journal_path
+        self.fsync = fsync
+        self._personas: dict[str, Persona] = {}
+        self._notes: list[tuple[str, PersonaNote]] = []
+        # The batch being written; still visible to reads until the flush lands.
+        self._inflight: dict[str, Persona] = {}
+        self._inflight_notes: list[tuple[str, PersonaNote]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._journal: Optional[Any] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._personas) + len(self._notes)
+
+    def snapshot(self) -> dict[str, int]:
+        return {"personas": len(self._personas), "notes": len(self._notes)}
+
+    def start(self) -> None:
+        if self._task:
+            return
+        if self.journal_path:
+            self._replay()
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._task = asyncio.create_task(self._run(), name="persona-write-behind")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out everything still buffered."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            kept = "kept in the journal" if self._journal else "lost"
+            logger.error(f"Final write-behind flush failed, {self.pending} writes {kept}: {e}")
+        finally:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._personas and not self._notes:
+                return
+            self._inflight, self._personas = self._personas, {}
+            self._inflight_notes, self._notes = self._notes, []
+            try:
+                await super().upsert_many(list(self._inflight.values()))
+                await super().insert_notes(self._inflight_notes)
+            except Exception:
+                # Requeue behind anything written meanwhile; newer persona states win.
+                self._personas = {**self._inflight, **self._personas}
+                self._notes = self._inflight_notes + self._notes
+                raise
+            finally:
+                self._inflight, self._inflight_notes = {}, []
+            self._compact()
+
+    async def get(self, user_id: str) -> Optional[Persona]:
+        buffered = self._buffered(user_id)
+        return buffered.model_copy() if buffered else await super().get(user_id)
+
+    async def get_many(self, user_ids: list[str]) -> dict[str, Persona]:
+        buffered = {uid: p.model_copy() for uid in user_ids if (p := self._buffered(uid))}
+        missing = [uid for uid in user_ids if uid not in buffered]
+        stored = await super().get_many(missing) if missing else {}
+        return {**stored, **buffered}
+
+    async def upsert(self, persona: Persona) -> None:
+        await self.upsert_many([persona])
+
+    async def upsert_many(self, personas: list[Persona]) -> None:
+        self.start()
+        for persona in personas:
+            # Buffered reads must match what the store returns once this is flushed.
+            persona = stored_view(persona)
+            self._personas[persona.user_id] = persona
+            self._log({"persona": persona.model_dump(mode="json", exclude={"notes"})})
+        self._written()
+
+    async def insert_notes(self, notes: list[tuple[str, PersonaNote]]) -> None:
+        if not notes:
+            return
+        self.start()
+        self._notes.extend(notes)
+        self._log({"notes": [[user_id, note] for user_id, note in notes]})
+        self._written()
+
+    async def recent_notes(self, user_id: str, limit: int) -> list[PersonaNote]:
+        if self._has_notes(user_id):
+            await self.flush()
+        return await super().recent_notes(user_id, limit)
+
+    async def notes_after(
+        self, user_id: str, after: Optional[tuple[str, int]], limit: int
+    ) -> list[PersonaNote]:
+        if self._has_notes(user_id):
+            await self.flush()
+        return await super().notes_after(user_id, after, limit)
+
+    def _buffered(self, user_id: str) -> Optional[Persona]:
+        return self._personas.get(user_id) or self._inflight.get(user_id)
+
+    def _has_notes(self, user_id: str) -> bool:
+        return any(uid == user_id for uid, _ in self._notes) or any(
+            uid == user_id for uid, _ in self._inflight_notes
+        )
+
+    def _written(self) -> None:
+        if self.pending >= self.max_pending:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Write-behind flush of {self.pending} writes failed: {e}")
+
+    def _log(self, entry: dict[str, Any]) -> None:
+        if not self._journal:
+            return
+        self._journal.write(to_json(entry, fallback=str).decode("utf-8") + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _compact(self) -> None:
+        """Rewrite the journal to hold only writes that are still buffered."""
+        if not self._journal:
+            return
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            for persona in self._personas.values():
+                entry = {"persona": persona.model_dump(mode="json", exclude={"notes"})}
+                tmp.write(to_json(entry, fallback=str).decode("utf-8") + "\n")
+            if self._notes:
+                tmp.write(to_json({"notes": self._notes}, fallback=str).decode("utf-8") + "\n")
+        self._journal.close()
+        os.replace(tmp_path, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write.
+                    continue
+                if "persona" in entry:
+                    persona = Persona.model_validate(entry["persona"])
+                    self._personas[persona.user_id] = persona
+                else:
+                    user_ids = [user_id for user_id, _ in entry["notes"]]
+                    notes = NOTE_ROWS.validate_python([note for _, note in entry["notes"]])
+                    self._notes.extend(zip(user_ids, notes))
+        if self.pending:
+            logger.info(f"Recovered {self.pending} unflushed persona writes from the journal")
+            self._wake.set()
@@ -0,0 +1,233 @@
+"""Deterministic local stand-ins for Gemini and Supabase used by the benchmarks."""
+import asyncio
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable
+
+
+class FakeQuotaError(Exception):
+    """Shaped like google.api_core's ResourceExhausted so the rate limiter retries it."""
+
+    code = 429
+
+
+@dataclass
+class FakeUsage:
+    prompt_token_count: int
+    candidates_token_count: int
+
+    @property
+    def total_token_count(self) -> int:
+        return self.prompt_token_count + self.candidates_token_count
+
+
+@dataclass
+class FakeResponse:
+    text: str
+    usage_metadata: FakeUsage
+
+
+class FakeStream:
+    def __init__(self, chunks: list[FakeResponse], delay: float) -> None:
+        self._chunks = chunks
+        self._delay = delay
+
+    async def _iterate(self) -> AsyncIterator[FakeResponse]:
+        for chunk in self._chunks:
+            await asyncio.sleep(self._delay)
+            yield chunk
+
+    def __aiter__(self) -> AsyncIterator[FakeResponse]:
+        return self._iterate()
+
+
+class FakeGenerativeModel:
+    """Drop-in for ``genai.GenerativeModel`` with configurable latency, jitter and errors.
+
+    Responses are derived from the prompt, so repeated runs produce the same output. A
+    batched-analysis prompt gets a JSON object back for every requested key.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "models/fake-gemini",
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.model_name = model_name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _plan(self, contents: str) -> tuple[float, bool]:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            return delay, self._random.random() < self.error_rate
+
+    def _respond(self, contents: str) -> FakeResponse:
+        keys = re.search(r"Keys: (\[.*?\])", contents)
+        if keys:
+            text = json.dumps({key: f"- summary for {key}" for key in json.loads(keys.group(1))})
+        else:
+            first_line = contents.split("\n", 1)[0][:60]
+            text = f"- insight derived from {len(contents)} chars ({first_line})"
+        usage = FakeUsage(len(contents) // 4 + 1, len(text) // 4 + 1)
+        return FakeResponse(text=text, usage_metadata=usage)
+
+    def generate_content(self, contents: str) -> FakeResponse:
+        delay, fail = self._plan(contents)
+        time.sleep(delay)
+        if fail:
+            raise FakeQuotaError("fake quota exceeded")
+        return self._respond(contents)
+
+    async def generate_content_async(self, contents: str, stream: bool = False) -> Any:
+        delay, fail = self._plan(contents)
+        if stream:
+            response = self._respond(contents)
+            words = response.text.split(" ")
+            chunks = [
+                FakeResponse(word + " ", FakeUsage(0, 1)) for word in words[:-1]
+            ] + [FakeResponse(words[-1], FakeUsage(0, 1))]
+            await asyncio.sleep(delay / 2)
+            if fail:
+                raise FakeQuotaError("fake quota exceeded")
+            return FakeStream(chunks, delay / 2 / max(1, len(chunks)))
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeQuotaError("fake quota exceeded")
+        return self._respond(contents)
+
+
+class FakeResult:
+    def __init__(self, data: list[dict[str, Any]]) -> None:
+        self.data = data
+
+
+class FakeQuery:
+    """Subset of the postgrest query builder used by the backend."""
+
+    def __init__(self, db: "FakeSupabase", table: str) -> None:
+        self.db = db
+        self.table = table
+        self.operation = "select"
+        self.rows: list[dict[str, Any]] = []
+        self.on_conflict = "id"
+        self.filters: list[Callable[[dict[str, Any]], bool]] = []
+        self.orders: list[tuple[str, bool]] = []
+        self.max_rows: int | None = None
+
+    def select(self, *columns: str, **_: Any) -> "FakeQuery":
+        self.operation = "select"
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        self.filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        self.filters.append(lambda row: row.get(column) is not None and row[column] >= value)
+        return self
+
+    def in_(self, column: str, values: list[Any]) -> "FakeQuery":
+        allowed = set(values)
+        self.filters.append(lambda row: row.get(column) in allowed)
+        return self
+
+    def or_(self, expression: str) -> "FakeQuery":
+        # Only the keyset form the backend emits: a.gt."x",and(a.eq."x",b.gt.y)
+        pattern = r'(\w+)\.gt\."([^"]*)",and\(\w+\.eq\."[^"]*",(\w+)\.gt\.(.+)\)$'
+        match = re.match(pattern, expression)
+        if not match:
+            raise ValueError(f"Unsupported or_ filter: {expression}")
+        first, value, second, tail = match.groups()
+        tail = tail.strip('"')
+        tail_value: Any = int(tail) if tail.isdigit() else tail
+        self.filters.append(
+            lambda row: (str(row.get(first)), row.get(second)) > (value, tail_value)
+        )
+        return self
+
+    def order(self, column: str, desc: bool = False, **_: Any) -> "FakeQuery":
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count: int) -> "FakeQuery":
+        self.max_rows = count
+        return self
+
+    def upsert(self, rows: Any, on_conflict: str = "id", **_: Any) -> "FakeQuery":
+        self.operation = "upsert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        return self
+
+    def insert(self, rows: Any, **_: Any) -> "FakeQuery":
+        self.operation = "insert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def execute(self) -> FakeResult:
+        if self.db.latency:
+            time.sleep(self.db.latency)
+        with self.db.lock:
+            self.db.calls[(self.table, self.operation)] += 1
+            table = self.db.tables.setdefault(self.table, [])
+            if self.operation == "upsert":
+                index = {row.get(self.on_conflict): i for i, row in enumerate(table)}
+                for row in self.rows:
+                    key = row.get(self.on_conflict)
+                    if key in index:
+                        table[index[key]] = {**table[index[key]], **row}
+                    else:
+                        index[key] = len(table)
+                        table.append(dict(row))
+                return FakeResult([dict(row) for row in self.rows])
+            if self.operation == "insert":
+                inserted = []
+                for row in self.rows:
+                    stored = {
+                        "id": next(self.db.ids),
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        **row,
+                    }
+                    table.append(stored)
+                    inserted.append(dict(stored))
+                return FakeResult(inserted)
+            rows = [row for row in table if all(f(row) for f in self.filters)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        if self.max_rows is not None:
+            rows = rows[: self.max_rows]
+        return FakeResult([dict(row) for row in rows])
+
+
+class FakeSupabase:
+    """In-memory tables behind the ``client.table(...)`` builder API."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.tables: dict[str, list[dict[str, Any]]] = {}
+        self.calls: Counter[tuple[str, str]] = Counter()
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
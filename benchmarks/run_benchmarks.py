@@ -0,0 +1,235 @@
+"""Offline benchmarks for the learn pipeline and persona API.
+
+Gemini and Supabase are replaced by the deterministic fakes in ``benchmarks.fakes`` so
+runs are reproducible and need no network or credentials::
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --latency 0.02 --iterations 50 --json out.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable
+
+# Settings are read once, so pin the knobs that would otherwise make runs
+# non-deterministic (response cache) or throttled (rate limits) before importing.
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://benchmark.invalid")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["SIGNAL_DEDUP_ENABLED"] = "false"
+os.environ["GEMINI_REQUESTS_PER_MINUTE"] = "1000000"
+os.environ["GEMINI_TOKENS_PER_MINUTE"] = "1000000000"
+os.environ["TRACING_ENABLED"] = "false"
+
+from .fakes import FakeGenerativeModel, FakeSupabase  # noqa: E402
+
+SIGNAL_TYPES = [
+    "chat",
+    "email_message",
+    "documents",
+    "social_profile",
+    "decision_history",
+    "sentiment",
+    "topic_interest",
+    "feedback_loop",
+]
+# Payload key each type's PROMPT_SIGNALS extractor reads; the rest read "text".
+PAYLOAD_KEYS = {"chat": "message", "social_profile": "bio", "decision_history": "log"}
+WORDS = "plan meeting budget roadmap launch travel family deadline review design".split()
+
+
+def make_signals(count: int, payload_chars: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Synthetic signals cycling through the text-based learning methods."""
+    signals = []
+    for i in range(count):
+        words = [WORDS[(seed + i * 7 + j) % len(WORDS)] for j in range(payload_chars // 6 + 1)]
+        text = " ".join(words)[:payload_chars]
+        signal_type = SIGNAL_TYPES[i % len(SIGNAL_TYPES)]
+        payload = {PAYLOAD_KEYS.get(signal_type, "text"): text}
+        signals.append({"type": signal_type, "payload": payload})
+    return signals
+
+
+def summarize(name: str, samples: list[float], wall: float, peak_bytes: int) -> dict[str, Any]:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))] * 1000
+
+    return {
+        "name": name,
+        "iterations": len(samples),
+        "p50_ms": round(pct(0.50), 2),
+        "p95_ms": round(pct(0.95), 2),
+        "p99_ms": round(pct(0.99), 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+        "throughput_per_s": round(len(samples) / wall, 2) if wall else 0.0,
+        "tracemalloc_peak_kb": round(peak_bytes / 1024, 1),
+    }
+
+
+async def measure(
+    name: str, fn: Callable[[int], Awaitable[Any]], iterations: int, concurrency: int
+) -> dict[str, Any]:
+    await fn(-1)  # warm-up: imports, singletons, first-call allocations
+    samples: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await fn(i)
+            samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    wall = time.perf_counter() - wall_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return summarize(name, samples, wall, peak)
+
+
+def install_fakes(
+    args: argparse.Namespace,
+) -> tuple[dict[str, FakeGenerativeModel], FakeSupabase]:
+    from backend.utils import gemini_client, persona_store, supabase_client
+    from backend.utils.config import get_settings
+
+    latency = {"strong": args.latency, "fast": args.fast_latency or args.latency}
+    models = {
+        tier: FakeGenerativeModel(
+            model_name=f"models/fake-{tier}",
+            latency=latency[tier],
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        for tier in gemini_client.TIERS
+    }
+    db = FakeSupabase(latency=args.db_latency)
+    for tier, model in models.items():
+        gemini_client._gemini_models[gemini_client.model_for(tier)] = model
+        gemini_client._async_gemini_clients[tier] = gemini_client.AsyncGeminiClient(
+            model,
+            max_workers=get_settings().gemini_executor_workers,
+            limiter=gemini_client.get_rate_limiter(),
+            tier=tier,
+        )
+    gemini_client._routed_clients.clear()
+    supabase_client._supabase = db
+    persona_store._persona_store = persona_store.PersonaStore(
+        db, chunk_size=get_settings().persona_batch_chunk_size
+    )
+    return models, db
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    models, db = install_fakes(args)
+
+    # Route modules build their agents at import time, so import after the fakes are in.
+    import httpx
+
+    from backend.agents.learning_engine import LearningEngine
+    from backend.api.main import app
+    from backend.models.persona import LearningSignal
+
+    engine = LearningEngine()
+    results: list[dict[str, Any]] = []
+
+    for count, chars in [(n, c) for n in args.signal_counts for c in args.payload_chars]:
+        signals = [LearningSignal(**s) for s in make_signals(count, chars, seed=args.seed)]
+
+        async def pipeline(i: int, signals: list[LearningSignal] = signals) -> Any:
+            return await engine.process_signals(f"bench-engine-{i}", signals, None)
+
+        results.append(
+            await measure(
+                f"engine.process_signals[{count}x{chars}]",
+                pipeline,
+                args.iterations,
+                args.concurrency,
+            )
+        )
+
+    signals = make_signals(args.signal_counts[0], args.payload_chars[0], seed=args.seed)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def post_learn(i: int) -> None:
+            body = {"user_id": f"bench-api-{max(i, 0)}", "signals": signals}
+            response = await client.post("/persona/learn", json=body)
+            response.raise_for_status()
+
+        async def get_persona(i: int) -> None:
+            response = await client.get(f"/persona/bench-api-{max(i, 0) % args.iterations}")
+            response.raise_for_status()
+
+        results.append(
+            await measure("POST /persona/learn", post_learn, args.iterations, args.concurrency)
+        )
+        results.append(
+            await measure("GET /persona/{user_id}", get_persona, args.iterations, args.concurrency)
+        )
+
+    return {
+        "python": platform.python_version(),
+        "config": {
+            key: value for key, value in vars(args).items() if key not in {"json"}
+        },
+        "gemini_calls": {tier: model.calls for tier, model in models.items()},
+        "supabase_calls": {f"{t}.{op}": n for (t, op), n in sorted(db.calls.items())},
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "results": results,
+    }
+
+
+def print_table(report: dict[str, Any]) -> None:
+    header = f"{'benchmark':<42}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>10}{'peak KB':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in report["results"]:
+        print(
+            f"{row['name']:<42}{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+            f"{row['throughput_per_s']:>10}{row['tracemalloc_peak_kb']:>10}"
+        )
+    calls = "  ".join(f"{tier} {n}" for tier, n in report["gemini_calls"].items())
+    print(f"\ngemini calls: {calls}  max RSS: {report['max_rss_kb']} KB")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--signal-counts", type=int, nargs="+", default=[3, 12])
+    parser.add_argument("--payload-chars", type=int, nargs="+", default=[200, 4000])
+    parser.add_argument("--latency", type=float, default=0.01, help="Fake Gemini latency (s)")
+    parser.add_argument(
+        "--fast-latency", type=float, help="Fake fast-tier latency (s); defaults to --latency"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--db-latency", type=float, default=0.0, help="Fake Supabase latency (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this path")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print_table(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Cold-start benchmark: time to import the app, run its lifespan and serve a request.
+
+Every sample is a fresh interpreter, so nothing is shared between runs::
+
+    python -m benchmarks.startup --runs 10 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from backend.api.main import app
+imported = time.perf_counter()
+
+async def serve():
+    import httpx
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get("/health")).raise_for_status()
+        return started, time.perf_counter()
+
+started, served = asyncio.run(serve())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "lifespan_ms": (started - imported) * 1000,
+    "first_request_ms": (served - started) * 1000,
+    "total_ms": (served - start) * 1000,
+}))
+"""
+
+
+def sample(env: dict[str, str]) -> dict[str, float]:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(env: dict[str, str], top: int) -> list[tuple[str, float]]:
+    """Slowest modules by cumulative import time, from ``python -X importtime``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.api.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((parts[2].strip(), int(parts[1]) / 1000))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports")
+    parser.add_argument("--json", help="Also write the report to this path")
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])),
+    }
+    samples = [sample(env) for _ in range(args.runs)]
+    report: dict[str, Any] = {"runs": args.runs, "phases": {}}
+    for phase in ("import_ms", "lifespan_ms", "first_request_ms", "total_ms"):
+        values = sorted(s[phase] for s in samples)
+        report["phases"][phase] = {
+            "min": round(values[0], 1),
+            "p50": round(statistics.median(values), 1),
+            "max": round(values[-1], 1),
+        }
+        print(
+            f"{phase:<18} min {values[0]:8.1f}  p50 {statistics.median(values):8.1f}"
+            f"  max {values[-1]:8.1f} ms"
+        )
+    if args.top:
+        report["slowest_imports_ms"] = import_profile(env, args.top)
+        print("\nslowest imports (cumulative ms):")
+        for module, ms in report["slowest_imports_ms"]:
+            print(f"  {ms:8.1f}  {module}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
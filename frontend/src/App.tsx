@@ -98,7 +98,7 @@ function App() {
   const [feedback, setFeedback] = useState("");
   const [textSignal, setTextSignal] = useState("");
   const [activeType, setActiveType] = useState<string>(learningMethods[0].type);
-  const { personaQuery, learnMutation } = usePersona(userId);
+  const { personaQuery, notesQuery, learnMutation } = usePersona(userId);
 
   const activeMethod = learningMethods.find((m) => m.type === activeType);
 
@@ -107,6 +107,11 @@ function App() {
     return personaQuery.data.persona;
   }, [personaQuery.data]);
 
+  const noteSummaries = useMemo(
+    () => notesQuery.data?.pages.flatMap((page) => page.notes.map((note) => note.summary)) ?? [],
+    [notesQuery.data]
+  );
+
   const handleSend = () => {
     if (!textSignal.trim()) return;
     const signals: LearningSignal[] = [
@@ -218,7 +223,8 @@ function App() {
                   />
                   <PersonaSection
                     title="Notes"
-                    items={personaData.notes}
+                    items={noteSummaries}
+                    hasMore={notesQuery.hasNextPage}
                     icon={<FileText className="w-4 h-4" />}
                   />
                 </div>
@@ -407,10 +413,12 @@ function App() {
 function PersonaSection({
   title,
   items,
+  hasMore = false,
   icon,
 }: {
   title: string;
   items: string[] | null | undefined;
+  hasMore?: boolean;
   icon: React.ReactNode;
 }) {
   const displayItems = Array.isArray(items) ? items : [];
@@ -420,7 +428,10 @@ function PersonaSection({
       <div className="flex items-center gap-2 mb-3">
         <div className="text-white/60">{icon}</div>
         <h4 className="text-sm font-medium text-white/80">{title}</h4>
-        <span className="ml-auto text-xs text-white/40">{displayItems.length}</span>
+        <span className="ml-auto text-xs text-white/40">
+          {displayItems.length}
+          {hasMore ? "+" : ""}
+        </span>
       </div>
       {displayItems.length > 0 ? (
         <div className="space-y-2">
@@ -435,7 +446,8 @@ function PersonaSection({
           ))}
           {displayItems.length > 4 && (
             <p className="text-xs text-white/40 mt-2">
-              +{displayItems.length - 4} more
+              +{displayItems.length - 4}
+              {hasMore ? "+" : ""} more
             </p>
           )}
         </div>
@@ -1,5 +1,18 @@
-import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
-import { fetchPersona, postLearn, PersonaUpdateRequest } from "../lib/api";
+import { useEffect } from "react";
+import {
+  useInfiniteQuery,
+  useMutation,
+  useQuery,
+  useQueryClient,
+} from "@tanstack/react-query";
+import {
+  fetchNotes,
+  fetchPersona,
+  personaChangesUrl,
+  postLearn,
+  PersonaChange,
+  PersonaUpdateRequest,
+} from "../lib/api";
 
 export const usePersona = (userId: string) => {
   const queryClient = useQueryClient();
@@ -8,15 +21,64 @@ export const usePersona = (userId: string) => {
     queryKey: ["persona", userId],
     queryFn: () => fetchPersona(userId),
     enabled: Boolean(userId),
+    // Updates are pushed over the change feed, so never refetch on a timer or focus.
+    staleTime: Infinity,
   });
 
+  // Nested under the persona key, so invalidating the persona refetches its notes too.
+  const notesQuery = useInfiniteQuery({
+    queryKey: ["persona", userId, "notes"],
+    queryFn: ({ pageParam }) => fetchNotes(userId, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next_cursor,
+    enabled: Boolean(userId),
+    staleTime: Infinity,
+  });
+
+  useEffect(() => {
+    if (!userId) return;
+    const queryKey = ["persona", userId];
+    const source = new EventSource(personaChangesUrl([userId]));
+    const refetch = () => queryClient.invalidateQueries({ queryKey });
+
+    source.addEventListener("persona", (event) => {
+      const change: PersonaChange = JSON.parse((event as MessageEvent).data);
+      if (change.notes.length > 0) {
+        queryClient.invalidateQueries({ queryKey: [...queryKey, "notes"] });
+      }
+      const current = queryClient.getQueryData<{ persona?: object; etag?: string }>(queryKey);
+      if (change.base_etag === null) {
+        // First event since anyone subscribed: it carries every field.
+        queryClient.setQueryData(queryKey, {
+          ...current,
+          persona: change.changes,
+          etag: change.etag,
+        });
+      } else if (current?.persona && current.etag === change.base_etag) {
+        queryClient.setQueryData(queryKey, {
+          ...current,
+          persona: { ...current.persona, ...change.changes },
+          etag: change.etag,
+        });
+      } else {
+        refetch();
+      }
+    });
+    source.addEventListener("resync", refetch);
+    source.onerror = () => {
+      // EventSource reconnects on its own; anything written meanwhile needs a refetch.
+      refetch();
+    };
+
+    return () => source.close();
+  }, [userId, queryClient]);
+
   const learnMutation = useMutation({
     mutationFn: (payload: PersonaUpdateRequest) => postLearn(payload),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ["persona", userId] });
-    },
+    // Always refetch after our own write: with several API workers the feed only sees
+    // writes made by the worker it is connected to.
+    onSuccess: () => queryClient.invalidateQueries({ queryKey: ["persona", userId] }),
   });
 
-  return { personaQuery, learnMutation };
+  return { personaQuery, notesQuery, learnMutation };
 };
-
@@ -1,7 +1,9 @@
 import axios from "axios";
 
+export const API_BASE_URL = "http://localhost:8000";
+
 const api = axios.create({
-  baseURL: "http://localhost:8000",
+  baseURL: API_BASE_URL,
 });
 
 export interface LearningSignal {
@@ -15,11 +17,45 @@ export interface PersonaUpdateRequest {
   feedback?: string;
 }
 
+export interface PersonaNote {
+  type: string;
+  summary: string;
+  id: number | null;
+  created_at: string | null;
+}
+
+export interface PersonaNotesPage {
+  user_id: string;
+  notes: PersonaNote[];
+  next_cursor: string | null;
+}
+
+export interface PersonaChange {
+  type: "persona";
+  user_id: string;
+  etag: string;
+  base_etag: string | null;
+  changes: Record<string, unknown>;
+  notes: Record<string, unknown>[];
+}
+
 export const fetchPersona = async (userId: string) => {
   const res = await api.get(`/persona/${userId}`);
+  // Change-feed diffs name the ETag they apply on top of.
+  return { ...res.data, etag: res.headers.etag as string | undefined };
+};
+
+// GET /persona/{id} does not embed notes; they are paged oldest first with a cursor.
+export const fetchNotes = async (userId: string, cursor?: string | null) => {
+  const res = await api.get<PersonaNotesPage>(`/persona/${userId}/notes`, {
+    params: cursor ? { cursor } : undefined,
+  });
   return res.data;
 };
 
+export const personaChangesUrl = (userIds: string[]) =>
+  `${API_BASE_URL}/persona/changes?user_ids=${userIds.map(encodeURIComponent).join(",")}`;
+
 export const postLearn = async (payload: PersonaUpdateRequest) => {
   const res = await api.post("/persona/learn", payload);
   return res.data;
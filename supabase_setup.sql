@@ -1,7 +1,7 @@
 -- Supabase Database Setup Script
 -- Run this in your Supabase SQL Editor
 
--- Create personas table
+-- Create personas table (current synthesized state only; notes live in persona_notes)
 CREATE TABLE IF NOT EXISTS personas (
   id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
   user_id TEXT NOT NULL UNIQUE,
@@ -9,18 +9,59 @@ CREATE TABLE IF NOT EXISTS personas (
   preferences JSONB DEFAULT '[]'::jsonb,
   interests JSONB DEFAULT '[]'::jsonb,
   risks JSONB DEFAULT '[]'::jsonb,
-  notes JSONB DEFAULT '[]'::jsonb,
+  features JSONB DEFAULT '{}'::jsonb,
+  version INTEGER NOT NULL DEFAULT 0,
   created_at TIMESTAMPTZ DEFAULT NOW(),
   updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Upgrade existing installs: version counter bumped on every incremental update
+ALTER TABLE personas ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+-- Statistics from locally analyzed numeric signals (response times, calendar, tasks)
+ALTER TABLE personas ADD COLUMN IF NOT EXISTS features JSONB DEFAULT '{}'::jsonb;
+
 -- Create index for faster lookups
 CREATE INDEX IF NOT EXISTS idx_personas_user_id ON personas(user_id);
 
+-- Bulk export pages through personas by (updated_at, user_id); NULLs would break the keyset
+UPDATE personas SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL;
+ALTER TABLE personas ALTER COLUMN updated_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_personas_updated_user ON personas(updated_at, user_id);
+
+-- Append-only learning notes, paged by (created_at, id)
+CREATE TABLE IF NOT EXISTS persona_notes (
+  id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  user_id TEXT NOT NULL REFERENCES personas(user_id) ON DELETE CASCADE,
+  type TEXT NOT NULL,
+  summary TEXT NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_persona_notes_user_created
+  ON persona_notes(user_id, created_at, id);
+
+-- Upgrade existing installs: move notes out of the personas row
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'personas' AND column_name = 'notes'
+  ) THEN
+    INSERT INTO persona_notes (user_id, type, summary, created_at)
+    SELECT p.user_id,
+           COALESCE(n.value->>'type', 'note'),
+           COALESCE(n.value->>'summary', n.value::text),
+           COALESCE(p.updated_at, NOW())
+    FROM personas p,
+         jsonb_array_elements(COALESCE(p.notes, '[]'::jsonb)) WITH ORDINALITY AS n(value, ord)
+    ORDER BY p.user_id, n.ord;
+    ALTER TABLE personas DROP COLUMN notes;
+  END IF;
+END $$;
+
 -- Optional: Enable Row Level Security (comment out if you want public access)
 -- ALTER TABLE personas ENABLE ROW LEVEL SECURITY;
 
 -- Optional: Create policy to allow service role access (if RLS is enabled)
 -- CREATE POLICY "Service role can do everything" ON personas
 --   FOR ALL USING (auth.role() = 'service_role');
-
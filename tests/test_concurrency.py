@@ -0,0 +1,139 @@
+"""Offline checks for the per-user learn lock and the write-behind journal.
+
+Gemini and Supabase are replaced by the fakes in ``benchmarks.fakes``::
+
+    python -m pytest tests
+"""
+import argparse
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import FakeSupabase
+from benchmarks.run_benchmarks import install_fakes
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fakes() -> None:
+    install_fakes(
+        argparse.Namespace(
+            latency=0.005, fast_latency=None, jitter=0.0, error_rate=0.0, db_latency=0.0, seed=0
+        )
+    )
+
+
+def _request(user_id: str, text: str, incremental: bool = False):
+    from backend.models.persona import PersonaUpdateRequest
+
+    return PersonaUpdateRequest(
+        user_id=user_id,
+        signals=[{"type": "sentiment", "payload": {"text": text}}],
+        incremental=incremental,
+    )
+
+
+def test_concurrent_learns_get_consecutive_versions() -> None:
+    from backend.agents.learning_engine import LearningEngine
+    from backend.agents.profile_agent import ProfileAgent
+    from backend.utils.persona_store import PersonaStore
+
+    async def main() -> None:
+        agent = ProfileAgent(LearningEngine())
+        store = PersonaStore(FakeSupabase(), chunk_size=500)
+        first = await agent.learn(_request("u1", "start"), store)
+        assert first.version == 1
+
+        learned = await asyncio.gather(
+            *[agent.learn(_request("u1", f"update {i}", incremental=True), store) for i in range(5)]
+        )
+        assert sorted(p.version for p in learned) == [2, 3, 4, 5, 6]
+        assert (await store.get("u1")).version == 6
+        assert len(agent.user_locks) == 0
+
+        rebuilt = await agent.learn(_request("u1", "rebuild"), store)
+        assert rebuilt.version == 7
+
+    asyncio.run(main())
+
+
+def test_write_behind_journal_replays_after_crash(tmp_path) -> None:
+    from backend.models.persona import Persona, PersonaNote
+    from backend.utils.persona_store import PersonaStore
+    from backend.utils.write_behind import WriteBehindStore
+
+    journal = str(tmp_path / "write-behind.jsonl")
+    db = FakeSupabase()
+
+    async def crash() -> None:
+        store = WriteBehindStore(db, 500, interval=60, max_pending=100, journal_path=journal)
+        await store.upsert(Persona(user_id="u1", traits=["calm"], version=3))
+        await store.insert_notes([("u1", PersonaNote(type="chat", summary="likes tea"))])
+        assert db.tables == {}
+        # Die without the final flush in ``stop``.
+        store._task.cancel()
+        await asyncio.gather(store._task, return_exceptions=True)
+        store._journal.close()
+
+    async def restart() -> None:
+        store = WriteBehindStore(db, 500, interval=60, max_pending=100, journal_path=journal)
+        store.start()
+        assert store.pending == 2
+        await store.stop()
+
+        persisted = PersonaStore(db, chunk_size=500)
+        persona = await persisted.get("u1")
+        assert persona is not None and persona.version == 3 and persona.traits == ["calm"]
+        notes = await persisted.recent_notes("u1", limit=10)
+        assert [note.summary for note in notes] == ["likes tea"]
+
+    asyncio.run(crash())
+    asyncio.run(restart())
+
+
+def test_ingestion_queue_drains_then_cancels_on_stop() -> None:
+    from backend.agents.ingestion_queue import IngestionQueue
+    from backend.agents.learning_engine import LearningEngine
+    from backend.agents.profile_agent import ProfileAgent
+
+    async def main() -> None:
+        queue = IngestionQueue(ProfileAgent(LearningEngine()))
+        drained = [queue.submit(_request(f"drain-{i}", "hello")) for i in range(4)]
+        await queue.stop()
+        assert [job.status for job in drained] == ["done"] * 4
+
+        queue.drain_seconds = 0
+        cut_off = [queue.submit(_request(f"cut-{i}", "hello")) for i in range(4)]
+        await asyncio.sleep(0)  # let the workers pick up the first jobs
+        await queue.stop()
+        assert {job.status for job in cut_off} == {"cancelled"}
+        assert all(job.finished_at for job in cut_off)
+
+    asyncio.run(main())
+
+
+def test_batch_and_single_learns_on_one_user_do_not_lose_updates() -> None:
+    from backend.agents.learning_engine import LearningEngine
+    from backend.agents.profile_agent import ProfileAgent
+    from backend.utils.persona_store import PersonaStore
+
+    async def main() -> None:
+        agent = ProfileAgent(LearningEngine())
+        store = PersonaStore(FakeSupabase(), chunk_size=500)
+        await agent.learn(_request("u1", "start"), store)
+
+        async def batch() -> list[dict]:
+            requests = [_request("u1", "batch", incremental=True), _request("u2", "other")]
+            return [result async for result in agent.learn_many(requests, store)]
+
+        single = [
+            agent.learn(_request("u1", f"single {i}", incremental=True), store) for i in range(3)
+        ]
+        results, *learned = await asyncio.gather(batch(), *single)
+        batched = next(r["persona"] for r in results if r["user_id"] == "u1")
+        assert sorted([batched.version, *(p.version for p in learned)]) == [2, 3, 4, 5]
+        assert (await store.get("u1")).version == 5
+
+        with pytest.raises(ValueError):
+            [r async for r in agent.learn_many([_request("u3", "a"), _request("u3", "b")], store)]
+
+    asyncio.run(main())